@@ -65,26 +65,87 @@ class OutOfMemory(Exception):
     pass
 
 
+## frames libres como un bitmap (un byte por frame, 1 = libre): siempre se asigna el
+## libre mas bajo, buscandolo con find desde el primero que puede estar libre
+class FrameAllocator():
+
+    def __init__(self, framesCount):
+        self._bitmap = bytearray(b'\x01') * framesCount
+        self._freeCount = framesCount
+        self._lowestFree = 0
+
+    @property
+    def freeCount(self):
+        return self._freeCount
+
+    ## retorna un frame libre, o None si no queda ninguno
+    def allocate(self):
+        frameNumber = self._bitmap.find(1, self._lowestFree)
+        if frameNumber == -1:
+            self._lowestFree = len(self._bitmap)
+            return None
+        self._bitmap[frameNumber] = 0
+        self._freeCount -= 1
+        self._lowestFree = frameNumber + 1
+        return frameNumber
+
+    ## retorna "count" frames libres, o falla sin asignar ninguno si no alcanzan
+    def allocateMany(self, count):
+        if count > self._freeCount:
+            raise OutOfMemory
+        return [self.allocate() for i in range(count)]
+
+    def free(self, frameNumber):
+        if self._bitmap[frameNumber] == 0:
+            self._bitmap[frameNumber] = 1
+            self._freeCount += 1
+            self._lowestFree = min(self._lowestFree, frameNumber)
+
+    def freeMany(self, frameNumbers):
+        for frameNumber in frameNumbers:
+            self.free(frameNumber)
+
+    ## cuantos huecos de frames libres contiguos hay y que tan partida esta la memoria libre
+    def fragmentation(self):
+        holes = [len(hole) for hole in self._bitmap.split(b'\x00') if hole]
+        largest = max(holes, default = 0)
+        return {'freeFrames': self._freeCount,
+                'holes': len(holes),
+                'largestHole': largest,
+                'fragmentation': 1 - largest / self._freeCount if self._freeCount else 0}
+
+
 class MemoryManager():
 
     def __init__(self, frameSize):
         self._frameSize = frameSize
         numberOfFrames = int(HARDWARE.memory.size / frameSize)
-        self.__freeFrames = []
-        for i in range(numberOfFrames):
-            self.__freeFrames.append(i)
+        self.__freeFrames = FrameAllocator(numberOfFrames)
 
     def getFreeFrame(self):
         try:
-            if self.__freeFrames:
-                return self.__freeFrames.pop(0)
-            else:
+            frameNumber = self.__freeFrames.allocate()
+            if frameNumber is None:
                 raise OutOfMemory
+            return frameNumber
+        except OutOfMemory:
+            print("The frame count isn't enough")
+
+    ## los frames de todas las paginas de un programa, de una sola vez
+    def getFreeFrames(self, count):
+        try:
+            return self.__freeFrames.allocateMany(count)
         except OutOfMemory:
             print("The frame count isn't enough")
 
     def setFreeFrame(self, frameNumber):
-        self.__freeFrames.append(frameNumber)
+        self.__freeFrames.free(frameNumber)
+
+    def setFreeFrames(self, frameNumbers):
+        self.__freeFrames.freeMany(frameNumbers)
+
+    def fragmentation(self):
+        return self.__freeFrames.fragmentation()
 
 
 class AbstractScheduler:
@@ -348,10 +409,7 @@ class NewInterruptionHandler(AbstractInterruptionHandler):
         priority = irq.parameters[1]
         pid = self.kernel.pcbTable.getNewPID()
         pagesCount = math.ceil(len(program) / self.kernel.frameSize)
-        pageTable = []
-        for i in range(pagesCount):
-            frame = self.kernel.memoryManager.getFreeFrame()
-            pageTable.append(frame)
+        pageTable = self.kernel.memoryManager.getFreeFrames(pagesCount)
         newPcb = Pcb(pid, pageTable, path, priority)
         self.kernel.loader.loadPage(program, pageTable)
         log.logger.info("\n Executing program: {name}".format(name=newPcb.path))
@@ -366,8 +424,7 @@ class KillInterruptionHandler(AbstractInterruptionHandler):
     def execute(self, irq):
         log.logger.info(" Program Finished ")
         pageTable = self.kernel.pcbTable.runningPcb.pageTable
-        for p in pageTable:
-            self.kernel.memoryManager.setFreeFrame(p)
+        self.kernel.memoryManager.setFreeFrames(pageTable)
         self.saveProcessState(ProcessState.TERMINATED)
         self.tryToRunReadyQ()
 
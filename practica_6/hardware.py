@@ -1,22 +1,31 @@
 #!/usr/bin/env python
 
 from tabulate import tabulate
-from time import sleep
+from time import sleep, monotonic
 from threading import Thread, Lock
+from collections import OrderedDict
+from array import array
+from math import inf
 import log
 
 ##  Estas son la instrucciones soportadas por nuestro CPU
-INSTRUCTION_IO = 'IO'
-INSTRUCTION_CPU = 'CPU'
-INSTRUCTION_EXIT = 'EXIT'
+##  se codifican como opcodes enteros de un byte; el 0 es una celda vacia
+INSTRUCTION_EMPTY = 0
+INSTRUCTION_CPU = 1
+INSTRUCTION_IO = 2
+INSTRUCTION_EXIT = 3
+
+MNEMONICS = ['', 'CPU', 'IO', 'EXIT']
 
 
 ## Helper for emulated machine code
+## las rafagas de instrucciones iguales se representan como una corrida
+## (instruccion, repeticiones) en vez de una lista con cada instruccion
 class ASM():
 
     @classmethod
     def EXIT(self, times):
-        return [INSTRUCTION_EXIT] * times
+        return (INSTRUCTION_EXIT, times)
 
     @classmethod
     def IO(self):
@@ -24,7 +33,7 @@ class ASM():
 
     @classmethod
     def CPU(self, times):
-        return [INSTRUCTION_CPU] * times
+        return (INSTRUCTION_CPU, times)
 
     @classmethod
     def isEXIT(self, instruction):
@@ -46,16 +55,22 @@ PAGE_FAULT_INTERRUPTION_TYPE = "#PAGE_FAULT"
 FRAME_USED_INTERRUPTION_TYPE = "#PAGE_FAULT"
 
 ## emulates an Interrupt request
+## core indica que procesador levanto la interrupcion (0 para los dispositivos)
 class IRQ:
 
-    def __init__(self, type, parameters = None):
+    def __init__(self, type, parameters = None, core = 0):
         self._type = type
         self._parameters = parameters
+        self._core = core
 
     @property
     def parameters(self):
         return self._parameters
 
+    @property
+    def core(self):
+        return self._core
+
     @property
     def type(self):
         return self._type
@@ -86,18 +101,34 @@ class InterruptVector():
 
 
 ## emulates the Internal Clock
+##
+## En modo "fast forward" el reloj funciona como un simulador de eventos discretos:
+## antes de cada tick le pregunta a sus suscriptores cuantos ticks pueden pasar sin
+## que ocurra nada (idleTicks) y saltea directamente hasta el proximo tick con trabajo,
+## avisandole a cada suscriptor cuantos ticks se salteo (skipTicks).
+## Un suscriptor que no implementa idleTicks nunca deja saltear ticks.
+##
+## Fuera de ese modo el ritmo lo marca tickRate (ticks por segundo, None = sin limite).
+## Cada tick tiene un deadline calculado desde el inicio de la corrida con un reloj
+## monotonico, asi el costo de los suscriptores no se acumula como atraso (drift).
 class Clock():
 
-    def __init__(self):
+    def __init__(self, tickRate = 1):
         self._subscribers = []
         self._running = False
         self._currentTick = 0
+        self._fastForward = False
+        self._tickRate = tickRate
+        self._ticksRun = 0
+        self._startTime = monotonic()
+        self._deadline = self._startTime
 
     def addSubscriber(self, subscriber):
         self._subscribers.append(subscriber)
 
     def stop(self):
         self._running = False
+        self.logTickRate()
 
     def start(self):
         if not self._running:
@@ -107,9 +138,12 @@ class Clock():
             t.start()
 
     def __start(self):
+        self.resetTickRate()
         tickNbr = 0
         while (self._running):
+            tickNbr = self.fastForwardFrom(tickNbr, inf)
             self.tick(tickNbr)
+            self.waitNextTick(1)
             tickNbr += 1
 
     def tick(self, tickNbr):
@@ -118,48 +152,284 @@ class Clock():
         ## notify all subscriber that a new clock cycle has started
         for subscriber in self._subscribers:
             subscriber.tick(tickNbr)
-        ## wait 1 second and keep looping
-        sleep(1)
 
-    def do_ticks(self, times):
+    ## ejecuta "times" ticks, o hasta que until() sea verdadero si se indica
+    def do_ticks(self, times, until = None):
         log.logger.info("---- :::: CLOCK do_ticks: {times} ::: -----".format(times=times))
-        for tickNbr in range(0, times):
+        self.resetTickRate()
+        tickNbr = self.fastForwardFrom(0, times)
+        while tickNbr < times:
             self.tick(tickNbr)
+            self.waitNextTick(1)
+            if until is not None and until():
+                break
+            tickNbr = self.fastForwardFrom(tickNbr + 1, times)
+        self.logTickRate()
+
+    ## registra que pasaron "times" ticks y, en tiempo real, espera hasta el deadline
+    ## del proximo tick. Si vamos atrasados no se duerme, y el deadline sigue fijo
+    ## para que el atraso se recupere en los ticks siguientes
+    def waitNextTick(self, times):
+        self._ticksRun += times
+        if self._fastForward or self._tickRate is None:
+            return
+        self._deadline += times / self._tickRate
+        delay = self._deadline - monotonic()
+        if delay > 0:
+            sleep(delay)
+
+    def resetTickRate(self):
+        self._ticksRun = 0
+        self._startTime = monotonic()
+        self._deadline = self._startTime
+
+    def logTickRate(self):
+        log.logger.info("---- :::: CLOCK ticks: {ticks}, {rate:.2f} ticks/s, drift: {drift:.3f}s ::: -----".format(ticks=self._ticksRun, rate=self.achievedTickRate, drift=self.drift))
+
+    ## cantidad de ticks, a partir de tickNbr, en los que ningun suscriptor tiene trabajo
+    def idleTicks(self, tickNbr):
+        idle = inf
+        for subscriber in self._subscribers:
+            if not hasattr(subscriber, 'idleTicks'):
+                return 0
+            idle = min(idle, subscriber.idleTicks(tickNbr))
+            if idle == 0:
+                return 0
+        return idle
+
+    ## saltea los ticks ociosos a partir de tickNbr (sin pasar de limit)
+    ## y retorna el numero del proximo tick que hay que ejecutar
+    def fastForwardFrom(self, tickNbr, limit):
+        if not self._fastForward:
+            return tickNbr
+        times = min(self.idleTicks(tickNbr), limit - tickNbr)
+        if times <= 0 or times == inf:
+            return tickNbr
+        log.logger.info("        --------------- fast forward: {first} to {last} ---------------".format(first = tickNbr, last = tickNbr + times - 1))
+        for subscriber in self._subscribers:
+            subscriber.skipTicks(tickNbr, times)
+        self._currentTick = tickNbr + times - 1
+        self.waitNextTick(times)
+        return tickNbr + times
 
     @property
     def currentTick(self):
         return self._currentTick
 
+    @property
+    def fastForward(self):
+        return self._fastForward
+
+    @fastForward.setter
+    def fastForward(self, fastForward):
+        self._fastForward = fastForward
+
+    ## ticks por segundo en tiempo real, None para correr a maxima velocidad
+    @property
+    def tickRate(self):
+        return self._tickRate
+
+    @tickRate.setter
+    def tickRate(self, tickRate):
+        self._tickRate = tickRate
+        self._deadline = monotonic()
+
+    ## ticks por segundo efectivamente logrados desde el inicio de la corrida
+    @property
+    def achievedTickRate(self):
+        elapsed = monotonic() - self._startTime
+        if elapsed <= 0:
+            return 0
+        return self._ticksRun / elapsed
+
+    ## segundos de atraso respecto del deadline (negativo si vamos adelantados)
+    @property
+    def drift(self):
+        if self._fastForward or self._tickRate is None:
+            return 0
+        return monotonic() - self._deadline
+
+    @property
+    def ticksRun(self):
+        return self._ticksRun
+
 ## emulates the main memory (RAM)
 class Memory():
 
     def __init__(self, size):
         self._size = size
-        self._cells = [''] * size
+        ## un byte por celda: cada celda guarda un opcode
+        self._cells = bytearray(size)
 
     def write(self, addr, value):
         self._cells[addr] = value
 
+    ## escribe "times" copias de value a partir de addr
+    def writeRun(self, addr, value, times):
+        self._cells[addr:addr + times] = bytes((value,)) * times
+
     def read(self, addr):
         return self._cells[addr]
 
+    ## cantidad de celdas consecutivas iguales a value desde addr (sin llegar a stop)
+    def runLength(self, addr, stop, value):
+        cells = self._cells[addr:stop]
+        return len(cells) - len(cells.lstrip(bytes((value,))))
+
     @property
     def size(self):
         return self._size
 
     def __repr__(self):
-        return tabulate(enumerate(self._cells), tablefmt='psql')
+        return tabulate(enumerate(MNEMONICS[opcode] for opcode in self._cells), tablefmt='psql')
         ##return "Memoria = {mem}".format(mem=self._cells)
 
 ## emulates the Memory Management Unit (MMU)
+## emulates the Translation Lookaside Buffer
+## cache de traducciones (asid, pagina) -> frame con "capacity" entradas repartidas en
+## conjuntos de "associativity" vias, con reemplazo LRU dentro de cada conjunto.
+## Como cada entrada tiene el ASID (el pid) de su proceso, un cambio de contexto no
+## necesita vaciar la TLB
+class TLB():
+
+    def __init__(self, capacity = 16, associativity = 4):
+        if capacity % associativity != 0:
+            raise Exception("TLB capacity {capacity} is not a multiple of its associativity {associativity}".format(capacity = capacity, associativity = associativity))
+        self._capacity = capacity
+        self._associativity = associativity
+        self._sets = [OrderedDict() for i in range(capacity // associativity)]
+        self._hits = 0
+        self._misses = 0
+        self._flushes = 0
+
+    def _setFor(self, asid, pageId):
+        return self._sets[hash((asid, pageId)) % len(self._sets)]
+
+    def lookup(self, asid, pageId):
+        entries = self._setFor(asid, pageId)
+        frameId = entries.get((asid, pageId))
+        if frameId is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+            entries.move_to_end((asid, pageId))
+        return frameId
+
+    def insert(self, asid, pageId, frameId):
+        entries = self._setFor(asid, pageId)
+        entries[(asid, pageId)] = frameId
+        entries.move_to_end((asid, pageId))
+        if len(entries) > self._associativity:
+            entries.popitem(last=False)
+
+    ## registra aciertos que no hizo falta buscar (por ejemplo, en una rafaga dentro de la misma pagina)
+    def countHits(self, times):
+        self._hits += times
+
+    ## borra las traducciones al frame (la pagina que estaba ahi fue desalojada)
+    def invalidateFrame(self, frameId):
+        for entries in self._sets:
+            for key in [key for key, mappedFrame in entries.items() if mappedFrame == frameId]:
+                del entries[key]
+
+    ## vacia toda la TLB o solo las entradas de un ASID
+    def flush(self, asid = None):
+        self._flushes += 1
+        for entries in self._sets:
+            if asid is None:
+                entries.clear()
+            else:
+                for key in [key for key in entries if key[0] == asid]:
+                    del entries[key]
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    @property
+    def associativity(self):
+        return self._associativity
+
+    @property
+    def hits(self):
+        return self._hits
+
+    @property
+    def misses(self):
+        return self._misses
+
+    @property
+    def flushes(self):
+        return self._flushes
+
+    @property
+    def hitRatio(self):
+        lookups = self._hits + self._misses
+        if lookups == 0:
+            return 0
+        return self._hits / lookups
+
+
+## secuencia de referencias (pid, page) que hicieron los fetch de todas las MMUs, para
+## analizarla despues (ver referenceAnalyzer). Se guarda comprimida en corridas: las
+## referencias seguidas a la misma pagina del mismo proceso suman a la ultima corrida
+class ReferenceString():
+
+    def __init__(self):
+        self._pids = array('l')
+        self._pages = array('l')
+        self._counts = array('l')
+
+    def record(self, pid, page, times = 1):
+        if self._pages and self._pages[-1] == page and self._pids[-1] == pid:
+            self._counts[-1] += times
+        else:
+            self._pids.append(pid)
+            self._pages.append(page)
+            self._counts.append(times)
+
+    ## cantidad de referencias (no de corridas)
+    def __len__(self):
+        return sum(self._counts)
+
+    ## corridas (pid, page, times)
+    def runs(self):
+        return zip(self._pids, self._pages, self._counts)
+
+    ## referencias de a una
+    def __iter__(self):
+        for pid, page, times in self.runs():
+            for i in range(times):
+                yield (pid, page)
+
+
+## cada core tiene su MMU, pero la pila LRU describe el uso de los frames de la
+## memoria compartida, asi que todas las MMUs de un Hardware comparten la misma.
+## La pila es un OrderedDict de frames (al final el usado mas recientemente), asi
+## que marcar un uso y sacar el menos usado cuestan O(1) sin importar cuantos frames haya.
+## Ademas, cada frame tiene sus bits de referencia y de modificacion (un byte por frame,
+## tambien compartidos): el fetch prende el de referencia y los algoritmos de seleccion
+## de victima los leen y los limpian sin destruir la pila LRU.
+## Las traducciones se buscan primero en la TLB y, si no estan, en la tabla de
+## paginas del proceso que esta corriendo: el registro base (pageTable) apunta a la
+## tabla del propio PCB, asi que un cambio de contexto no copia nada y lo que el
+## kernel actualiza en la tabla se ve directamente desde la MMU
 class MMU():
 
-    def __init__(self, memory):
+    def __init__(self, memory, interruptVector, coreId = 0, LRUStack = None, tlb = None, referenceBits = None, modifiedBits = None):
         self._memory = memory
+        self._interruptVector = interruptVector
+        self._coreId = coreId
         self._frameSize = 0
         self._limit = 999
-        self._tlb = dict()
-        self._LRUStack = []
+        self._asid = None
+        self._pageTable = []
+        self._tlb = TLB() if tlb is None else tlb
+        self._LRUStack = OrderedDict() if LRUStack is None else LRUStack
+        ## como el tamaño de frame lo elige el kernel, alcanza para cualquier tamaño (frames <= celdas)
+        self._referenceBits = bytearray(memory.size) if referenceBits is None else referenceBits
+        self._modifiedBits = bytearray(memory.size) if modifiedBits is None else modifiedBits
+        self._referenceString = None
 
     @property
     def limit(self):
@@ -177,27 +447,114 @@ class MMU():
     def frameSize(self, frameSize):
         self._frameSize = frameSize
 
+    ## ASID (pid) del proceso cuyas traducciones se estan usando
+    @property
+    def asid(self):
+        return self._asid
+
+    @asid.setter
+    def asid(self, asid):
+        self._asid = asid
+
+    ## registro base de la tabla de paginas del proceso que esta corriendo
+    @property
+    def pageTable(self):
+        return self._pageTable
+
+    @pageTable.setter
+    def pageTable(self, pageTable):
+        self._pageTable = pageTable
+
+    @property
+    def tlb(self):
+        return self._tlb
+
+    ## si no es None, cada fetch agrega (asid, pagina) a esta ReferenceString
+    @property
+    def referenceString(self):
+        return self._referenceString
+
+    @referenceString.setter
+    def referenceString(self, referenceString):
+        self._referenceString = referenceString
+
+    ## bits de referencia y modificacion, indexados por frameId
+    @property
+    def referenceBits(self):
+        return self._referenceBits
+
+    @property
+    def modifiedBits(self):
+        return self._modifiedBits
+
+    ## limpia los bits de referencia de los primeros "frames" frames
+    def clearReferenceBits(self, frames):
+        self._referenceBits[:frames] = bytes(frames)
+
+    ## un frame recien cargado todavia no fue referenciado ni modificado
+    def clearFrameBits(self, frameId):
+        self._referenceBits[frameId] = 0
+        self._modifiedBits[frameId] = 0
+
     def resetTLB(self):
-        return dict()
+        self._tlb.flush()
 
-    def setPageFrame(self, pageId, frameId):
-        self._tlb[pageId] = frameId
+    def flushTLB(self, asid):
+        self._tlb.flush(asid)
 
-    def setLastUse(self, frameId):
-        for i, f in enumerate(self._LRUStack):
-            if f == frameId:
-                self._LRUStack.pop(i)
-        self._LRUStack.insert(0, frameId)
+    ## deja de traducir a frameId (la pagina que estaba ahi fue desalojada); la tabla
+    ## de paginas ya la actualizo el kernel, solo hay que limpiar la TLB
+    def invalidateFrame(self, frameId):
+        self._tlb.invalidateFrame(frameId)
 
-    def getUses(self):
-        uses = self._LRUStack.copy()
-        self._LRUStack.clear()
-        return uses
+    def setLastUse(self, frameId):
+        self._LRUStack[frameId] = None
+        self._LRUStack.move_to_end(frameId)
 
     def getLastUsed(self):
-        return self._LRUStack.pop()
+        return self._LRUStack.popitem(last = False)[0]
 
 
+    ## cantidad de instrucciones CPU consecutivas desde logicalAddress
+    ## hasta el final de su pagina (0 si la pagina no esta cargada)
+    def burstLength(self, logicalAddress):
+        if logicalAddress > self._limit:
+            return 0
+        pageId = logicalAddress // self._frameSize
+        frameId = self._pageTable[pageId]
+        if frameId is None:
+            return 0
+        offset = logicalAddress % self._frameSize
+        frameBaseDir = self._frameSize * frameId
+        return self._memory.runLength(frameBaseDir + offset, frameBaseDir + self._frameSize, INSTRUCTION_CPU)
+
+    ## equivale a hacer fetch de las "times" direcciones desde logicalAddress,
+    ## que tienen que estar en la misma pagina; retorna la ultima instruccion
+    def fetchBurst(self, logicalAddress, times):
+        instruction = self.fetch(logicalAddress + times - 1)
+        ## las otras busquedas son aciertos: la primera dejo la pagina en la TLB
+        self._tlb.countHits(times - 1)
+        if self._referenceString is not None:
+            self._referenceString.record(self._asid, logicalAddress // self._frameSize, times - 1)
+        return instruction
+
+    ## TLB miss: buscamos el frame en la tabla de paginas y, si la pagina
+    ## no esta cargada, levantamos un page fault. Si el kernel la tiene que traer
+    ## del disco de swap, el proceso deja el CPU y se retorna None
+    def walk(self, pageId):
+        pageTable = self._pageTable
+        frameId = pageTable[pageId]
+        if frameId is None:
+            pageFaultIRQ = IRQ(PAGE_FAULT_INTERRUPTION_TYPE, pageId, self._coreId)
+            self._interruptVector.handle(pageFaultIRQ)
+            # una vez resuelto el pageFault, volvemos a buscar en la Page Table
+            # del proceso (puede que ya no sea la que esta usando la MMU)
+            frameId = pageTable[pageId]
+            if frameId is None:
+                return None
+        self._tlb.insert(self._asid, pageId, frameId)
+        return frameId
+
     def fetch(self,  logicalAddress):
         if (logicalAddress > self._limit):
             raise Exception("Invalid Address,  {logicalAddress} is higher than process limit: {limit}".format(limit = self._limit, logicalAddress = logicalAddress))
@@ -207,16 +564,17 @@ class MMU():
         offset = logicalAddress % self._frameSize
         #
         # buscamos la direccion Base del frame donde esta almacenada la pagina
-        frameId = self._tlb[pageId]
+        frameId = self._tlb.lookup(self._asid, pageId)
         if frameId is None:
-            pageFaultIRQ = IRQ(PAGE_FAULT_INTERRUPTION_TYPE, pageId)
-            HARDWARE.interruptVector.handle(pageFaultIRQ)
-            # una vez resuelto el pageFault, volvemos a buscar en la Page Table
-            # ya que la pagina, ahora debe estar cargada si o si
-            frameId = self._tlb[pageId]
+            frameId = self.walk(pageId)
+            if frameId is None:
+                return None
 
         ### setear los flags manejados por el MMU para los algoritmos de seleccion de victima
         self.setLastUse(frameId)
+        self._referenceBits[frameId] = 1
+        if self._referenceString is not None:
+            self._referenceString.record(self._asid, pageId)
         #
         ##calculamos la direccion fisica resultante
         frameBaseDir  = self._frameSize * frameId
@@ -229,26 +587,63 @@ class MMU():
 ## emulates the main Central Processor Unit
 class Cpu():
 
-    def __init__(self, mmu, interruptVector):
+    def __init__(self, mmu, interruptVector, coreId = 0):
         self._mmu = mmu
         self._interruptVector = interruptVector
+        self._coreId = coreId
         self._pc = -1
         self._ir = None
         self._enable_stats = False
+        self._burstMode = False
+        ## contadores para medir utilizacion y throughput del core
+        self._ticks = 0
+        self._busyTicks = 0
+        self._instructions = 0
+        ## tabla de despacho indexada por opcode
+        self._instructionSet = [self._executeCPU, self._executeCPU, self._executeIO, self._executeEXIT]
 
 
     def tick(self, tickNbr):
         self._stats()
+        self._ticks += 1
         if (self.isBusy()):
-            self._fetch()
-            self._decode()
-            self._execute()
+            self._busyTicks += 1
+            ## si el fetch termino en un page fault que espera al disco,
+            ## la instruccion no se ejecuta (se va a volver a buscar)
+            if self._fetch():
+                self._instructions += 1
+                self._decode()
+                self._execute()
         else:
             log.logger.info("cpu - NOOP")
 
+    ## ticks que el CPU puede pasar sin levantar interrupciones: todos si esta ocioso (NOOP)
+    ## y, en modo rafaga, las instrucciones CPU consecutivas que quedan en la pagina actual
+    def idleTicks(self, tickNbr):
+        if not self.isBusy():
+            return inf
+        if self._burstMode:
+            return self._mmu.burstLength(self._pc)
+        return 0
+
+    def skipTicks(self, tickNbr, times):
+        for i in range(times):
+            self._stats()
+        self._ticks += times
+        if self.isBusy():
+            self._busyTicks += times
+            self._instructions += times
+            self._ir = self._mmu.fetchBurst(self._pc, times)
+            self._pc += times
+            log.logger.info("cpu - Exec burst: {instr} x {times}, PC={pc}".format(instr=MNEMONICS[self._ir], times=times, pc=self._pc))
+
     def _fetch(self):
-        self._ir = self._mmu.fetch(self._pc)
+        instruction = self._mmu.fetch(self._pc)
+        if instruction is None:
+            return False
+        self._ir = instruction
         self._pc += 1
+        return True
 
     def _decode(self):
         ## decode no hace nada en este caso
@@ -256,22 +651,52 @@ class Cpu():
 
     def _stats(self):
         if self._enable_stats:
-            statsIRQ = IRQ(STAT_INTERRUPTION_TYPE)
+            statsIRQ = IRQ(STAT_INTERRUPTION_TYPE, None, self._coreId)
             self._interruptVector.handle(statsIRQ)
 
     def _execute(self):
-        if ASM.isEXIT(self._ir):
-            killIRQ = IRQ(KILL_INTERRUPTION_TYPE)
-            self._interruptVector.handle(killIRQ)
-        elif ASM.isIO(self._ir):
-            ioInIRQ = IRQ(IO_IN_INTERRUPTION_TYPE, self._ir)
-            self._interruptVector.handle(ioInIRQ)
-        else:
-            log.logger.info("cpu - Exec: {instr}, PC={pc}".format(instr=self._ir, pc=self._pc))
+        self._instructionSet[self._ir]()
+
+    def _executeEXIT(self):
+        killIRQ = IRQ(KILL_INTERRUPTION_TYPE, None, self._coreId)
+        self._interruptVector.handle(killIRQ)
+
+    def _executeIO(self):
+        ioInIRQ = IRQ(IO_IN_INTERRUPTION_TYPE, self._ir, self._coreId)
+        self._interruptVector.handle(ioInIRQ)
+
+    def _executeCPU(self):
+        log.logger.info("cpu - Exec: {instr}, PC={pc}".format(instr=MNEMONICS[self._ir], pc=self._pc))
 
     def isBusy(self):
         return self._pc > -1
 
+    @property
+    def coreId(self):
+        return self._coreId
+
+    ## fraccion de los ticks en que el core estuvo ejecutando un proceso
+    @property
+    def utilization(self):
+        if self._ticks == 0:
+            return 0
+        return self._busyTicks / self._ticks
+
+    ## instrucciones ejecutadas por tick
+    @property
+    def throughput(self):
+        if self._ticks == 0:
+            return 0
+        return self._instructions / self._ticks
+
+    @property
+    def ticks(self):
+        return self._ticks
+
+    @property
+    def instructions(self):
+        return self._instructions
+
     @property
     def pc(self):
         return self._pc
@@ -280,6 +705,16 @@ class Cpu():
     def pc(self, addr):
         self._pc = addr
 
+    ## en modo rafaga el CPU retira de un solo paso las instrucciones CPU consecutivas
+    ## (solo tiene efecto con el reloj en modo fast forward)
+    @property
+    def burstMode(self):
+        return self._burstMode
+
+    @burstMode.setter
+    def burstMode(self, burstMode):
+        self._burstMode = burstMode
+
     @property
     def enable_stats(self):
         return self._enable_stats
@@ -289,14 +724,15 @@ class Cpu():
         self._enable_stats = enable_stats
 
     def __repr__(self):
-        return "CPU(PC={pc})".format(pc=self._pc)
+        return "CPU{core}(PC={pc})".format(core=self._coreId, pc=self._pc)
 
 ## emulates an Input/output device of the Hardware
 class AbstractIODevice():
 
-    def __init__(self, deviceId, deviceTime):
+    def __init__(self, deviceId, deviceTime, interruptVector):
         self._deviceId = deviceId
         self._deviceTime = deviceTime
+        self._interruptVector = interruptVector
         self._busy = False
 
     @property
@@ -327,14 +763,30 @@ class AbstractIODevice():
                 ## operation execution has finished
                 self._busy = False
                 ioOutIRQ = IRQ(IO_OUT_INTERRUPTION_TYPE, self._deviceId)
-                HARDWARE.interruptVector.handle(ioOutIRQ)
+                self._interruptVector.handle(ioOutIRQ)
             else:
                 log.logger.info("device {deviceId} - Busy: {ticksCount} of {deviceTime}".format(deviceId = self.deviceId, ticksCount = self._ticksCount, deviceTime = self._deviceTime))
 
+    ## ticks que faltan hasta el tick en que termina la operacion en curso
+    def idleTicks(self, tickNbr):
+        if self._busy:
+            return self._deviceTime - self._ticksCount
+        return inf
+
+    def skipTicks(self, tickNbr, times):
+        if self._busy:
+            self._ticksCount += times
+
 
 class PrinterIODevice(AbstractIODevice):
-    def __init__(self):
-        super(PrinterIODevice, self).__init__("Printer", 3)
+    def __init__(self, interruptVector):
+        super(PrinterIODevice, self).__init__("Printer", 3, interruptVector)
+
+
+## disco de swap de donde se traen las paginas: cada operacion es leer una pagina
+class SwapIODevice(AbstractIODevice):
+    def __init__(self, interruptVector, deviceTime = 5):
+        super(SwapIODevice, self).__init__("Swap", deviceTime, interruptVector)
 
 
 class Timer:
@@ -349,16 +801,32 @@ class Timer:
     def tick(self, tickNbr):
         if self._active and (self._tickCount >= self._quantum) and self._cpu.isBusy():
             # se “cumplio” el limite de ejecuciones
-            timeoutIRQ = IRQ(TIMEOUT_INTERRUPTION_TYPE)
+            timeoutIRQ = IRQ(TIMEOUT_INTERRUPTION_TYPE, None, self._cpu.coreId)
             self._interruptVector.handle(timeoutIRQ)
 
         # registro que el proceso en CPU corrio un ciclo mas
         self._tickCount += 1
         self._cpu.tick(tickNbr)
 
+    ## el timer no deja saltear el tick en que se cumple el quantum
+    def idleTicks(self, tickNbr):
+        idle = self._cpu.idleTicks(tickNbr)
+        if self._active and self._cpu.isBusy():
+            idle = min(idle, max(0, self._quantum - self._tickCount))
+        return idle
+
+    def skipTicks(self, tickNbr, times):
+        self._tickCount += times
+        self._cpu.skipTicks(tickNbr, times)
+
     def reset(self):
            self._tickCount = 0
 
+    ## ticks que corrio el proceso actual desde el ultimo reset
+    @property
+    def tickCount(self):
+        return self._tickCount
+
     @property
     def quantum(self):
         return self._quantum
@@ -370,20 +838,40 @@ class Timer:
 
 
 ## emulates the Hardware that were the Operative System run
+## cada instancia es una maquina independiente: ningun componente usa estado global,
+## asi que se pueden emular muchas maquinas en el mismo interprete
 class Hardware():
 
     ## Setup our hardware
-    def setup(self, memorySize):
+    ## cada uno de los "cores" tiene su propio CPU, MMU y Timer; la memoria,
+    ## el vector de interrupciones, el reloj y los dispositivos son compartidos.
+    ## Con swapTime, las paginas se leen de un disco de swap que tarda swapTime ticks;
+    ## sin el, los page faults se resuelven en el momento
+    def setup(self, memorySize, cores = 1, tlbSize = 16, tlbAssociativity = 4, swapTime = None):
         ## add the components to the "motherboard"
         self._memory = Memory(memorySize)
         self._interruptVector = InterruptVector()
         self._clock = Clock()
-        self._ioDevice = PrinterIODevice()
-        self._mmu = MMU(self._memory)
-        self._cpu = Cpu(self._mmu, self._interruptVector)
-        self._timer = Timer(self._cpu, self._interruptVector)
+        self._ioDevice = PrinterIODevice(self._interruptVector)
         self._clock.addSubscriber(self._ioDevice)
-        self._clock.addSubscriber(self._timer)
+        self._swapDevice = None
+        if swapTime is not None:
+            self._swapDevice = SwapIODevice(self._interruptVector, swapTime)
+            self._clock.addSubscriber(self._swapDevice)
+        LRUStack = OrderedDict()
+        referenceBits = bytearray(memorySize)
+        modifiedBits = bytearray(memorySize)
+        self._mmus = []
+        self._cpus = []
+        self._timers = []
+        for coreId in range(cores):
+            mmu = MMU(self._memory, self._interruptVector, coreId, LRUStack, TLB(tlbSize, tlbAssociativity), referenceBits, modifiedBits)
+            cpu = Cpu(mmu, self._interruptVector, coreId)
+            timer = Timer(cpu, self._interruptVector)
+            self._mmus.append(mmu)
+            self._cpus.append(cpu)
+            self._timers.append(timer)
+            self._clock.addSubscriber(timer)
 
     def switchOn(self):
         log.logger.info(" ---- SWITCH ON ---- ")
@@ -393,9 +881,18 @@ class Hardware():
         self.clock.stop()
         log.logger.info(" ---- SWITCH OFF ---- ")
 
+    ## cpu, mmu y timer son los del core 0
     @property
     def cpu(self):
-        return self._cpu
+        return self._cpus[0]
+
+    @property
+    def cpus(self):
+        return self._cpus
+
+    @property
+    def coresCount(self):
+        return len(self._cpus)
 
     @property
     def clock(self):
@@ -411,20 +908,37 @@ class Hardware():
 
     @property
     def mmu(self):
-        return self._mmu
+        return self._mmus[0]
+
+    @property
+    def mmus(self):
+        return self._mmus
 
     @property
     def ioDevice(self):
         return self._ioDevice
 
+    ## None si la maquina no tiene disco de swap
+    @property
+    def swapDevice(self):
+        return self._swapDevice
+
     @property
     def timer(self):
-        return self._timer
+        return self._timers[0]
+
+    @property
+    def timers(self):
+        return self._timers
+
+    ## empieza a grabar las referencias de todas las MMUs en una ReferenceString y la retorna
+    def recordReferences(self):
+        referenceString = ReferenceString()
+        for mmu in self._mmus:
+            mmu.referenceString = referenceString
+        return referenceString
 
     def __repr__(self):
-        return "HARDWARE state {cpu}\n{mem}".format(cpu=self._cpu, mem=self._memory)
+        return "HARDWARE state {cpus}\n{mem}".format(cpus=self._cpus, mem=self._memory)
 
-### HARDWARE is a global variable
-### can be access from any
-HARDWARE = Hardware()
 
@@ -1,3 +1,5 @@
+from functools import partial
+
 from so import *
 
 class SchedulerType(Enum):
@@ -5,17 +7,37 @@ class SchedulerType(Enum):
     Priority = 2
     PriorityPreentive = 3
     RoundRobin = 4
+    MultiLevelFeedback = 5
+    CompletelyFair = 6
+    ShortestJobFirst = 7
+    ShortestRemainingTime = 8
+    EarliestDeadlineFirst = 9
 
 
 class KernelBuilder():
 
-    def buildKernel(self, schedulerType, frameSize, algorithmType):
+    ## con perCoreQueues cada core tiene su propia cola de listos (ver SchedulerPerCore);
+    ## prefetch es la ventana maxima de paginas que se precargan en cada page fault (ver Loader);
+    ## burstPredictor es como SJF/SRTF estiman las rafagas (por defecto, leyendo el programa)
+    def buildKernel(self, hardware, schedulerType, frameSize, algorithmType, perCoreQueues = False, prefetch = 0, burstPredictor = None):
         SCHEDULER = {
-            SchedulerType.FirstComeFirstServed: SchedulerFCFS(),
-            SchedulerType.Priority: SchedulerPriority(),
-            SchedulerType.PriorityPreentive: SchedulerPriorityPRENTIVE(),
-            SchedulerType.RoundRobin: SchedulerRoundRobin()
+            SchedulerType.FirstComeFirstServed: SchedulerFCFS,
+            SchedulerType.Priority: SchedulerPriority,
+            SchedulerType.PriorityPreentive: SchedulerPriorityPRENTIVE,
+            SchedulerType.RoundRobin: SchedulerRoundRobin,
+            SchedulerType.MultiLevelFeedback: SchedulerMLFQ,
+            SchedulerType.CompletelyFair: SchedulerCFS,
+            SchedulerType.ShortestJobFirst: SchedulerSJF,
+            SchedulerType.ShortestRemainingTime: SchedulerSRTF,
+            SchedulerType.EarliestDeadlineFirst: SchedulerEDF
         }
-        return Kernel(SCHEDULER.get(schedulerType), frameSize, algorithmType)
+        schedulerClass = SCHEDULER.get(schedulerType)
+        if burstPredictor is not None and issubclass(schedulerClass, SchedulerSJF):
+            schedulerClass = partial(schedulerClass, predictor = burstPredictor)
+        if perCoreQueues:
+            scheduler = SchedulerPerCore(hardware, schedulerClass)
+        else:
+            scheduler = schedulerClass(hardware)
+        return Kernel(hardware, scheduler, frameSize, algorithmType, prefetch)
 
 KERNEL_BUILDER = KernelBuilder()
\ No newline at end of file
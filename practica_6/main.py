@@ -8,11 +8,12 @@ if __name__ == '__main__':
     log.setupLogger()
     log.logger.info('Starting emulator')
 
-    ## setup our hardware and set memory size to 25 "cells"
-    HARDWARE.setup(16)
+    ## setup our hardware and set memory size to 16 "cells"
+    hardware = Hardware()
+    hardware.setup(16)
 
     ## Switch on computer
-    HARDWARE.switchOn()
+    hardware.switchOn()
 
     ## new create the Operative System Kernel
     # "booteamos" el sistema operativo
@@ -20,8 +21,12 @@ if __name__ == '__main__':
     # VictimAlgorithim.FiFo
     # VictimAlgorithim.LRU
     # VictimAlgorithim.Clock
+    # VictimAlgorithim.NRU
+    # VictimAlgorithim.ARC
+    # VictimAlgorithim.TwoQ
+    # VictimAlgorithim.ClockPro
 
-    kernel = KERNEL_BUILDER.buildKernel(SchedulerType.FirstComeFirstServed, 4, VictimAlgorithim.FiFo)
+    kernel = KERNEL_BUILDER.buildKernel(hardware, SchedulerType.FirstComeFirstServed, 4, VictimAlgorithim.FiFo)
 
     # Ahora vamos a intentar ejecutar 3 programas a la vez
     ##################
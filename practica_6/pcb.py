@@ -16,6 +16,10 @@ class Pcb():
         self.__state = ProcessState.NEW
         self.__path = path
         self.__priority = priority
+        self.__lastCore = None
+        self.__schedulingLevel = None
+        self.__vruntime = None
+        self.__deadline = None
 
     @property
     def pid(self):
@@ -53,6 +57,42 @@ class Pcb():
     def priority(self):
         return self.__priority
 
+    ## ultimo core en el que corrio el proceso
+    @property
+    def lastCore(self):
+        return self.__lastCore
+
+    @lastCore.setter
+    def lastCore(self, value):
+        self.__lastCore = value
+
+    ## nivel de la cola multinivel del scheduler (None si el scheduler no usa niveles)
+    @property
+    def schedulingLevel(self):
+        return self.__schedulingLevel
+
+    @schedulingLevel.setter
+    def schedulingLevel(self, value):
+        self.__schedulingLevel = value
+
+    ## tiempo de CPU ponderado por prioridad (None hasta que lo encole un scheduler que lo usa)
+    @property
+    def vruntime(self):
+        return self.__vruntime
+
+    @vruntime.setter
+    def vruntime(self, value):
+        self.__vruntime = value
+
+    ## tick en que el proceso tiene que haber terminado (None si no tiene deadline)
+    @property
+    def deadline(self):
+        return self.__deadline
+
+    @deadline.setter
+    def deadline(self, value):
+        self.__deadline = value
+
     def __repr__(self):
         return "PCB(pid={pid}, state={state}, pc={pc}, path={path})"\
          .format(pid=self.__pid, state=self.__state, pc=self.__pc, path=self.__path)
@@ -63,7 +103,8 @@ class PcbTable():
     def __init__(self):
         self.__currentPID = None
         self.__pcbs = {}
-        self.__runningPcb = None
+        ## proceso corriendo en cada core (core -> pcb)
+        self.__runningPcbs = {}
 
     def getNewPID(self):
         if self.__currentPID is not None:
@@ -81,17 +122,31 @@ class PcbTable():
     def remove(self, pid):
         del self.__pcbs[pid]
 
+    ## runningPcb es el proceso que corre en el core 0
     @property
     def runningPcb(self):
-        return self.__runningPcb
+        return self.getRunningPcb(0)
 
     @runningPcb.setter
     def runningPcb(self, value):
-        self.__runningPcb = value
+        self.setRunningPcb(0, value)
+
+    def getRunningPcb(self, core):
+        return self.__runningPcbs.get(core)
+
+    def setRunningPcb(self, core, pcb):
+        if pcb is None:
+            self.__runningPcbs.pop(core, None)
+        else:
+            self.__runningPcbs[core] = pcb
+
+    ## pares (core, pcb) de los cores que estan ejecutando un proceso
+    def runningPcbs(self):
+        return list(self.__runningPcbs.items())
 
     @property
     def getPcb(self, number):
-        return self.__runningPcb[number]
+        return self.__runningPcbs[number]
 
     def getPcbs(self):
         return self.__pcbs.values()
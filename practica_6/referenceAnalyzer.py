@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+
+## Analisis offline de una secuencia de referencias grabada con hardware.recordReferences():
+## cuantos page faults haria el algoritmo optimo de Belady (OPT) y cuantos LRU para
+## cualquier cantidad de frames, sin volver a correr el emulador.
+##
+##   references = hardware.recordReferences()
+##   ... correr el kernel ...
+##   compare(references, [4, 8, 16])
+##
+## Las referencias pueden ser una ReferenceString (se recorren sus corridas) o cualquier
+## secuencia de paginas. Una corrida de la misma pagina cuesta como mucho un fault:
+## despues de la primera referencia, la pagina ya esta en memoria.
+
+from heapq import heappush, heappop
+from math import inf
+
+
+## paginas distintas consecutivas y cuantas referencias tiene cada corrida
+def _runs(references):
+    keys = []
+    counts = []
+    if hasattr(references, 'runs'):
+        pairs = (((pid, page), times) for pid, page, times in references.runs())
+    else:
+        pairs = ((key, 1) for key in references)
+    for key, times in pairs:
+        if keys and keys[-1] == key:
+            counts[-1] += times
+        else:
+            keys.append(key)
+            counts.append(times)
+    return keys, counts
+
+
+## page faults de OPT con "frames" frames: ante un fault desaloja la pagina que se va
+## a volver a usar mas tarde (o nunca). El proximo uso de cada referencia se calcula
+## recorriendo la secuencia al reves, y las paginas cargadas estan en un heap por
+## proximo uso (las entradas viejas del heap se descartan al sacarlas)
+def optMisses(references, frames):
+    if frames < 1:
+        raise Exception("OPT needs at least one frame, got {frames}".format(frames = frames))
+    keys, counts = _runs(references)
+    nextUse = [inf] * len(keys)
+    lastSeen = dict()
+    for i in range(len(keys) - 1, -1, -1):
+        nextUse[i] = lastSeen.get(keys[i], inf)
+        lastSeen[keys[i]] = i
+    resident = dict()
+    heap = []
+    misses = 0
+    for i, key in enumerate(keys):
+        if key not in resident:
+            misses += 1
+            if len(resident) == frames:
+                while True:
+                    negatedNextUse, victim = heappop(heap)
+                    if resident.get(victim) == -negatedNextUse:
+                        break
+                del resident[victim]
+        resident[key] = nextUse[i]
+        heappush(heap, (-nextUse[i], key))
+    return misses
+
+
+## distancia de pila LRU (Mattson) de la primera referencia de cada corrida: cuantas
+## paginas distintas se usaron desde la ultima vez que se uso esta, mas uno (inf si es
+## la primera vez). Con c frames, LRU tiene un fault justo cuando la distancia es > c.
+## Las ultimas referencias de cada pagina se marcan en un arbol de Fenwick indexado por
+## posicion, asi que cada distancia se calcula en O(log n)
+def lruStackDistances(references):
+    keys, counts = _runs(references)
+    tree = [0] * (len(keys) + 1)
+
+    def add(position, value):
+        position += 1
+        while position < len(tree):
+            tree[position] += value
+            position += position & -position
+
+    def prefix(position):
+        position += 1
+        total = 0
+        while position > 0:
+            total += tree[position]
+            position -= position & -position
+        return total
+
+    lastAccess = dict()
+    distances = []
+    for i, key in enumerate(keys):
+        previous = lastAccess.get(key)
+        if previous is None:
+            distances.append(inf)
+        else:
+            distances.append(prefix(i - 1) - prefix(previous) + 1)
+            add(previous, -1)
+        add(i, 1)
+        lastAccess[key] = i
+    return distances, counts
+
+
+## page faults de LRU para 0, 1, ..., maxFrames frames, en una sola pasada
+## (por defecto hasta la cantidad de paginas distintas, donde solo quedan los faults obligatorios)
+def lruMissCurve(references, maxFrames = None):
+    distances, counts = lruStackDistances(references)
+    coldMisses = sum(1 for distance in distances if distance == inf)
+    if maxFrames is None:
+        maxFrames = coldMisses
+    histogram = [0] * (maxFrames + 2)
+    for distance in distances:
+        if distance != inf:
+            histogram[min(distance, maxFrames + 1)] += 1
+    misses = [sum(counts)]
+    pending = len(distances) - coldMisses
+    for frames in range(1, maxFrames + 1):
+        pending -= histogram[frames]
+        misses.append(coldMisses + pending)
+    return misses
+
+
+## fraccion de referencias que son fault con LRU, para 0..maxFrames frames
+def lruMissRatioCurve(references, maxFrames = None):
+    misses = lruMissCurve(references, maxFrames)
+    total = misses[0]
+    return [miss / total if total else 0 for miss in misses]
+
+
+## faults de LRU y de OPT para cada cantidad de frames de frameCounts
+def compare(references, frameCounts):
+    total = len(references)
+    curve = lruMissCurve(references, max(frameCounts))
+    rows = []
+    for frames in frameCounts:
+        opt = optMisses(references, frames)
+        rows.append({'frames': frames,
+                     'references': total,
+                     'lruMisses': curve[frames],
+                     'optMisses': opt,
+                     'lruMissRatio': curve[frames] / total if total else 0,
+                     'optMissRatio': opt / total if total else 0})
+    return rows
@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+
+## Cargas de trabajo para comparar los algoritmos de seleccion de victima: un programa
+## largo que recorre su codigo una sola vez (scan) mientras llegan, escalonadas, varias
+## instancias de un programa "caliente" cuyas paginas se comparten entre instancias.
+## Con pocos frames, FiFo/LRU/Clock dejan que el recorrido desaloje las paginas
+## calientes; ARC, 2Q y CLOCK-Pro las protegen porque son las unicas que se reusan.
+##
+##   python replacementBenchmark.py
+##
+## Se compara la cantidad de paginas leidas (pageLoads): los page faults que se resuelven
+## mapeando una pagina que ya estaba en memoria no leen nada.
+
+from sweep import runScenario
+from kernelBuilder import *
+
+
+## (programa, prioridad, tick de llegada) como en sweep.DEFAULT_WORKLOAD
+def scanWorkload(scanLength, hotLength, instances, gap):
+    scan = Program("scan.exe", [ASM.CPU(scanLength)])
+    hot = Program("hot.exe", [ASM.CPU(hotLength)])
+    return [(scan, 1, 0)] + [(hot, 1, instance * gap) for instance in range(instances)]
+
+
+## nombre -> (carga de trabajo, tamaño de memoria) con frames de 4 instrucciones
+WORKLOADS = {
+    'scan+hot': (scanWorkload(1200, 60, 20, 25), 56),
+    'scan+hot, poca memoria': (scanWorkload(1200, 40, 20, 20), 32),
+}
+
+FRAME_SIZE = 4
+
+
+## paginas leidas por cada algoritmo para cada carga de trabajo
+def compareAlgorithms(workloads = WORKLOADS, algorithmTypes = tuple(VictimAlgorithim), schedulerType = SchedulerType.RoundRobin):
+    rows = []
+    for name, (workload, memorySize) in workloads.items():
+        for algorithmType in algorithmTypes:
+            result = runScenario(schedulerType, algorithmType, FRAME_SIZE, memorySize, workload = workload)
+            rows.append({'workload': name, 'algorithmType': algorithmType.name,
+                         'pageFaults': result['pageFaults'], 'pageLoads': result['pageLoads']})
+    return rows
+
+
+if __name__ == '__main__':
+    rows = compareAlgorithms()
+    print(tabulate([[row['workload'], row['algorithmType'], row['pageFaults'], row['pageLoads']] for row in rows],
+                   headers=['Workload', 'Algoritmo', 'Page faults', 'Paginas leidas']))
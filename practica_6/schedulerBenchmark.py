@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+
+## Cargas de trabajo para comparar schedulers: equidad (indice de Jain del servicio
+## recibido sobre el que le correspondia a cada proceso, ver StatTable.fairnessIndex)
+## y latencia (tiempos de respuesta, espera y retorno promedio). SRTF, que conoce las
+## rafagas leyendo los programas, da el menor tiempo de espera y sirve de referencia.
+## Con deadlines, se cuentan los procesos que terminaron tarde.
+##
+##   python schedulerBenchmark.py
+
+from sweep import runScenario
+from kernelBuilder import *
+
+
+## (programa, prioridad, tick de llegada) como en sweep.DEFAULT_WORKLOAD
+def multiTenantWorkload(tenants = 6, length = 40):
+    return [(Program("tenant{n}.exe".format(n=n), [ASM.CPU(length)]), n % 3, 0) for n in range(tenants)]
+
+
+## procesos interactivos (rafagas cortas entre IOs) mezclados con procesos que solo usan CPU
+def mixedWorkload(interactive = 4, cpuBound = 3):
+    workload = []
+    for n in range(interactive):
+        program = Program("io{n}.exe".format(n=n), [ASM.CPU(1), ASM.IO(), ASM.CPU(2), ASM.IO(), ASM.CPU(1), ASM.IO(), ASM.CPU(1)])
+        workload.append((program, n % 3, n * 3))
+    for n in range(cpuBound):
+        workload.append((Program("cpu{n}.exe".format(n=n), [ASM.CPU(30)]), n, n * 5))
+    return workload
+
+
+## trabajos con deadline (el cuarto elemento, en ticks desde la llegada) y uno sin deadline
+def deadlineWorkload():
+    return [(Program("long.exe", [ASM.CPU(20)]), 1, 0, 45),
+            (Program("control.exe", [ASM.CPU(4)]), 1, 3, 8),
+            (Program("sensor.exe", [ASM.CPU(6), ASM.IO(), ASM.CPU(2)]), 1, 6, 24),
+            (Program("batch.exe", [ASM.CPU(10)]), 1, 8),
+            (Program("report.exe", [ASM.CPU(5)]), 1, 12, 30)]
+
+
+WORKLOADS = {
+    'multi-tenant': multiTenantWorkload(),
+    'mixed': mixedWorkload(),
+    'deadlines': deadlineWorkload(),
+}
+
+FRAME_SIZE = 4
+MEMORY_SIZE = 256
+
+FIELDS = ['fairness', 'weightedFairness', 'avgResponseTime', 'avgWaitingTime', 'avgReturnTime', 'deadlineMisses']
+
+
+def compareSchedulers(workloads = WORKLOADS, schedulerTypes = tuple(SchedulerType)):
+    rows = []
+    for name, workload in workloads.items():
+        for schedulerType in schedulerTypes:
+            result = runScenario(schedulerType, VictimAlgorithim.FiFo, FRAME_SIZE, MEMORY_SIZE, workload = workload)
+            row = {'workload': name, 'schedulerType': schedulerType.name}
+            row.update({field: result[field] for field in FIELDS})
+            rows.append(row)
+    return rows
+
+
+if __name__ == '__main__':
+    rows = compareSchedulers()
+    print(tabulate([[row['workload'], row['schedulerType']] + [row[field] for field in FIELDS] for row in rows],
+                   headers=['Workload', 'Scheduler', 'Equidad', 'Equidad ponderada', 'Respuesta', 'Espera', 'Retorno', 'Deadlines vencidos'],
+                   floatfmt='.3f'))
@@ -1,5 +1,8 @@
 #!/usr/bin/env python
 import math
+from bisect import bisect_right
+from collections import OrderedDict
+from heapq import heappush, heappop
 from random import randint
 
 from hardware import *
@@ -7,12 +10,80 @@ from pcb import *
 import log
 
 
+## imagen compacta de un programa compilado: guarda corridas (instruccion, repeticiones)
+## junto con la direccion logica donde empieza cada una, asi ocupa memoria
+## proporcional a la cantidad de corridas y no a la cantidad de instrucciones
+class ProgramImage:
+
+    def __init__(self):
+        self._instructions = []
+        self._counts = []
+        self._starts = []
+        self._size = 0
+
+    def append(self, instruction, times = 1):
+        if times <= 0:
+            return
+        if self._instructions and self._instructions[-1] == instruction:
+            self._counts[-1] += times
+        else:
+            self._instructions.append(instruction)
+            self._counts.append(times)
+            self._starts.append(self._size)
+        self._size += times
+
+    def last(self):
+        return self._instructions[-1]
+
+    def runsCount(self):
+        return len(self._instructions)
+
+    ## retorna la instruccion en la direccion logica addr
+    def __getitem__(self, addr):
+        if addr < 0 or addr >= self._size:
+            raise IndexError("Address {addr} out of program image".format(addr=addr))
+        return self._instructions[bisect_right(self._starts, addr) - 1]
+
+    def __len__(self):
+        return self._size
+
+    ## recorre las porciones de corridas que caen en [start, stop)
+    ## como tuplas (direccion, instruccion, repeticiones)
+    def runs(self, start, stop):
+        stop = min(stop, self._size)
+        index = bisect_right(self._starts, start) - 1
+        addr = start
+        while addr < stop:
+            runEnd = self._starts[index] + self._counts[index]
+            times = min(runEnd, stop) - addr
+            yield (addr, self._instructions[index], times)
+            addr += times
+            index += 1
+
+    ## rafaga de CPU desde addr: instrucciones hasta el proximo IO o EXIT, inclusive
+    def burstLength(self, addr):
+        if addr >= self._size:
+            return 0
+        index = bisect_right(self._starts, addr) - 1
+        if self._instructions[index] != INSTRUCTION_CPU:
+            return 1
+        length = self._starts[index] + self._counts[index] - addr
+        if index + 1 < len(self._instructions):
+            length += 1
+        return length
+
+    def __repr__(self):
+        runs = ["{instr}x{times}".format(instr=MNEMONICS[instr], times=times) if times > 1 else MNEMONICS[instr]
+                for instr, times in zip(self._instructions, self._counts)]
+        return "[{runs}]".format(runs=", ".join(runs))
+
+
 ## emulates a compiled program
 class Program:
 
     def __init__(self, name, instructions):
         self._name = name
-        self._instructions = self.expand(instructions)
+        self._instructions = self.compile(instructions)
 
     @property
     def name(self):
@@ -25,23 +96,26 @@ class Program:
     def addInstr(self, instruction):
         self._instructions.append(instruction)
 
-    def expand(self, instructions):
-        expanded = []
+    def compile(self, instructions):
+        image = ProgramImage()
         for i in instructions:
-            if isinstance(i, list):
+            if isinstance(i, tuple):
+                ## is a run of instructions (instruction, times)
+                image.append(i[0], i[1])
+            elif isinstance(i, list):
                 ## is a list of instructions
-                expanded.extend(i)
+                for instruction in i:
+                    image.append(instruction)
             else:
                 ## a single instr (a String)
-                expanded.append(i)
+                image.append(i)
 
         ## now test if last instruction is EXIT
         ## if not... add an EXIT as final instruction
-        last = expanded[-1]
-        if not ASM.isEXIT(last):
-            expanded.append(INSTRUCTION_EXIT)
+        if not ASM.isEXIT(image.last()):
+            image.append(INSTRUCTION_EXIT)
 
-        return expanded
+        return image
 
     def __repr__(self):
         return "Program({name}, {instructions})".format(name=self._name, instructions=self._instructions)
@@ -65,121 +139,564 @@ class FileSystem():
         return len(self.__disk.get(path))
 
 
+## frames libres como un bitmap (un byte por frame, 1 = libre): siempre se asigna el
+## libre mas bajo, buscandolo con find desde el primero que puede estar libre, asi
+## que el costo no crece con la cantidad de frames de la memoria
+class FrameAllocator():
+
+    def __init__(self, framesCount):
+        self._bitmap = bytearray(b'\x01') * framesCount
+        self._freeCount = framesCount
+        self._lowestFree = 0
+
+    @property
+    def framesCount(self):
+        return len(self._bitmap)
+
+    @property
+    def freeCount(self):
+        return self._freeCount
+
+    def isFree(self, frameNumber):
+        return self._bitmap[frameNumber] == 1
+
+    ## retorna un frame libre, o None si no queda ninguno
+    def allocate(self):
+        frameNumber = self._bitmap.find(1, self._lowestFree)
+        if frameNumber == -1:
+            self._lowestFree = len(self._bitmap)
+            return None
+        self._bitmap[frameNumber] = 0
+        self._freeCount -= 1
+        self._lowestFree = frameNumber + 1
+        return frameNumber
+
+    ## retorna "count" frames libres, o falla sin asignar ninguno si no alcanzan
+    def allocateMany(self, count):
+        if count > self._freeCount:
+            raise Exception("Not enough free frames: {count} requested, {free} free".format(count = count, free = self._freeCount))
+        return [self.allocate() for i in range(count)]
+
+    def free(self, frameNumber):
+        if self._bitmap[frameNumber] == 0:
+            self._bitmap[frameNumber] = 1
+            self._freeCount += 1
+            self._lowestFree = min(self._lowestFree, frameNumber)
+
+    def freeMany(self, frameNumbers):
+        for frameNumber in frameNumbers:
+            self.free(frameNumber)
+
+    ## cuantos huecos de frames libres contiguos hay y que tan partida esta la memoria libre
+    ## (0 = toda en un solo hueco, cerca de 1 = todos huecos de un frame)
+    def fragmentation(self):
+        holes = [len(hole) for hole in self._bitmap.split(b'\x00') if hole]
+        largest = max(holes, default = 0)
+        return {'freeFrames': self._freeCount,
+                'holes': len(holes),
+                'largestHole': largest,
+                'fragmentation': 1 - largest / self._freeCount if self._freeCount else 0}
+
+
+## una pagina de texto cargada en un frame; como los programas nunca escriben su
+## texto, todos los procesos que corren el mismo programa (path) la comparten
+class SharedPage():
+
+    def __init__(self, path, page, pcb):
+        self._path = path
+        self._page = page
+        self._pcbs = [pcb]
+
+    @property
+    def path(self):
+        return self._path
+
+    @property
+    def page(self):
+        return self._page
+
+    ## procesos que tienen la pagina en su tabla de paginas
+    @property
+    def pcbs(self):
+        return self._pcbs
+
+    @property
+    def refCount(self):
+        return len(self._pcbs)
+
+
+## ademas de pedirle frames al algoritmo de seleccion de victima, lleva la tabla de
+## frames: para cada frame, que pagina (SharedPage) tiene cargada, o None si esta libre.
+## Las paginas se comparten por (path, page) con un contador de referencias: un proceso
+## que necesita una pagina que ya esta en memoria solo la mapea, desalojarla la saca
+## de las tablas de todos los procesos que la usan y el frame se libera recien cuando
+## termina el ultimo de ellos
 class MemoryManager:
 
-    def __init__(self, victimSelectionAlgorithm):
+    def __init__(self, victimSelectionAlgorithm, hardware, frameSize):
         self._victimSelectionAlgorithm = victimSelectionAlgorithm
+        self._hardware = hardware
+        self._frameTable = [None] * (hardware.memory.size // frameSize)
+        ## (path, page) -> frame de las paginas cargadas
+        self._residentPages = dict()
+        self._sharedMappings = 0
+        self._pageLoads = 0
 
-    def getFreeFrame(self):
-        return self._victimSelectionAlgorithm.getFrame()
+    @property
+    def frameTable(self):
+        return self._frameTable
+
+    ## si la pagina page del programa de pcb ya esta en memoria, la mapea en su tabla de paginas
+    def mapSharedPage(self, pcb, page):
+        frameNumber = self._residentPages.get((pcb.path, page))
+        if frameNumber is None:
+            return False
+        self._frameTable[frameNumber].pcbs.append(pcb)
+        pcb.pageTable[page] = frameNumber
+        self._sharedMappings += 1
+        self._victimSelectionAlgorithm.pageReused(frameNumber)
+        return True
+
+    ## retorna un frame para la pagina page de pcb, desalojando la que estuviera ahi
+    def getFreeFrame(self, pcb, page):
+        frameNumber = self._victimSelectionAlgorithm.getFrame((pcb.path, page))
+        if self._frameTable[frameNumber] is not None:
+            self.evict(frameNumber)
+        self._frameTable[frameNumber] = SharedPage(pcb.path, page, pcb)
+        self._residentPages[(pcb.path, page)] = frameNumber
+        self._pageLoads += 1
+        return frameNumber
 
     def setFreeFrame(self, frameNumber):
+        sharedPage = self._frameTable[frameNumber]
+        del self._residentPages[(sharedPage.path, sharedPage.page)]
+        self._frameTable[frameNumber] = None
         self._victimSelectionAlgorithm.setFreeFrame(frameNumber)
 
+    ## pcb termino: deja de usar sus paginas y se liberan las que nadie mas usa
+    def setFreeFrames(self, pcb):
+        frameNumbers = []
+        for frameNumber in pcb.pageTable:
+            if frameNumber is None:
+                continue
+            sharedPage = self._frameTable[frameNumber]
+            sharedPage.pcbs.remove(pcb)
+            if sharedPage.refCount == 0:
+                del self._residentPages[(sharedPage.path, sharedPage.page)]
+                self._frameTable[frameNumber] = None
+                frameNumbers.append(frameNumber)
+        self._victimSelectionAlgorithm.setFreeFrames(frameNumbers)
+
+    @property
+    def freeFramesCount(self):
+        return self._victimSelectionAlgorithm.frameAllocator.freeCount
+
+    def fragmentation(self):
+        return self._victimSelectionAlgorithm.frameAllocator.fragmentation()
+
+    ## paginas en memoria, cuantas veces se mapeo una pagina ya cargada en vez de cargarla
+    ## y cuantas paginas se cargaron (lecturas del programa)
+    def sharingStats(self):
+        return {'residentPages': len(self._residentPages),
+                'sharedMappings': self._sharedMappings,
+                'pageLoads': self._pageLoads}
+
+    ## las tablas se modifican en el lugar: pueden ser las que esta apuntando alguna MMU
+    def evict(self, frameNumber):
+        sharedPage = self._frameTable[frameNumber]
+        for pcb in sharedPage.pcbs:
+            pcb.pageTable[sharedPage.page] = None
+        del self._residentPages[(sharedPage.path, sharedPage.page)]
+        ## ninguna MMU (ni su TLB) puede seguir traduciendo al frame desalojado
+        for mmu in self._hardware.mmus:
+            mmu.invalidateFrame(frameNumber)
+
 class VictimAlgorithim(Enum):
     FiFo = 1
     LRU = 2
     Clock = 3
+    NRU = 4
+    ARC = 5
+    TwoQ = 6
+    ClockPro = 7
 
+## los algoritmos solo eligen el numero de frame; el desalojo lo hace el MemoryManager.
+## pageKey es la pagina (path, page) que se va a cargar, para los que la necesitan
 class AbstractAlgorithm():
     def __init__(self, kernel):
         self._kernel = kernel
-        numberOfFrames = int(HARDWARE.memory.size / self._kernel.frameSize)
-        self._freeFrames = []
-        for i in range(numberOfFrames):
-            self._freeFrames.append(i)
+        numberOfFrames = int(self._kernel.hardware.memory.size / self._kernel.frameSize)
+        self._numberOfFrames = numberOfFrames
+        self._frameAllocator = FrameAllocator(numberOfFrames)
+
+    @property
+    def frameAllocator(self):
+        return self._frameAllocator
 
-    def getFrame(self):
+    def getFrame(self, pageKey = None):
         pass
 
-    def setFreeFrame(self, frameNumber):
+    ## otro proceso empezo a usar la pagina que ya estaba cargada en el frame
+    def pageReused(self, frameNumber):
         pass
 
-    def updatePageTable(self, pcb, frameNumber):
-        actualPageTable = pcb.pageTable
-        pcb.pageTable = [None if x == frameNumber else x for x in actualPageTable]
+    def setFreeFrame(self, frameNumber):
+        self._frameAllocator.free(frameNumber)
+
+    def setFreeFrames(self, frameNumbers):
+        self._frameAllocator.freeMany(frameNumbers)
 
 class FiFoAlgorithm(AbstractAlgorithm):
     def __init__(self, kernel):
         super().__init__(kernel)
-        self._usedFrames = []
-
-    def getFrame(self):
-        if self._freeFrames:
-            number = self._freeFrames.pop(0)
-        else:
-            frame = self._usedFrames.pop(0)
-            number = frame[0]
-            pcb = frame[1]
-            self.updatePageTable(pcb, number)
-        self._usedFrames.append((number, self._kernel.pcbTable.runningPcb))
+        ## frames en uso, en orden de asignacion
+        self._usedFrames = OrderedDict()
+
+    def getFrame(self, pageKey = None):
+        number = self._frameAllocator.allocate()
+        if number is None:
+            number = self._usedFrames.popitem(last = False)[0]
+        self._usedFrames[number] = None
         return number
 
     def setFreeFrame(self, frameNumber):
-        for i, frame in enumerate(self._usedFrames):
-            if frame == frameNumber:
-                self._usedFrames.pop(i)
-                self._freeFrames.append(frameNumber)
+        if frameNumber in self._usedFrames:
+            del self._usedFrames[frameNumber]
+            self._frameAllocator.free(frameNumber)
+
+    def setFreeFrames(self, frameNumbers):
+        for frameNumber in frameNumbers:
+            self.setFreeFrame(frameNumber)
 
 class LruAlgorithm(AbstractAlgorithm):
 
+    def getFrame(self, pageKey = None):
+        mmu = self._kernel.hardware.mmu
+        number = self._frameAllocator.allocate()
+        if number is None:
+            number = mmu.getLastUsed()
+        ## el frame recien asignado cuenta como usado aunque todavia no se haya leido
+        mmu.setLastUse(number)
+        return number
+
+## segunda oportunidad: la aguja saltea (y limpia) los frames con el bit de referencia prendido
+class ClockAlgorithm(AbstractAlgorithm):
     def __init__(self, kernel):
         super().__init__(kernel)
-        self._usedFrames = dict()
+        self._needle = 0
 
-    def getFrame(self):
-        if self._freeFrames:
-            number = self._freeFrames.pop(0)
-        else:
-            number = HARDWARE.mmu.getLastUsed()
-            pcb = self._usedFrames[number]
-            self.updatePageTable(pcb, number)
-        self._usedFrames[number] = self._kernel.pcbTable.runningPcb
+    def getFrame(self, pageKey = None):
+        number = self._frameAllocator.allocate()
+        if number is not None:
+            return number
+        referenceBits = self._kernel.hardware.mmu.referenceBits
+        while referenceBits[self._needle]:
+            referenceBits[self._needle] = 0
+            self.moveNeedle()
+        number = self._needle
+        self.moveNeedle()
         return number
 
-    def setFreeFrame(self, frameNumber):
-        self._freeFrames.append(frameNumber)
-        self._usedFrames[frameNumber] = None
+    def moveNeedle(self):
+        self._needle = (self._needle + 1) % self._numberOfFrames
 
-class ClockAlgorithm(AbstractAlgorithm):
+## Not Recently Used: elige un frame de la clase mas baja (referenciado, modificado)
+## empezando desde donde quedo la ultima busqueda, y despues limpia todos los bits
+## de referencia para que la proxima eleccion vea solo los usos recientes
+class NruAlgorithm(AbstractAlgorithm):
     def __init__(self, kernel):
         super().__init__(kernel)
-        self._usedFrames = dict()
-        self._needle = 0
+        self._hand = 0
+
+    def getFrame(self, pageKey = None):
+        number = self._frameAllocator.allocate()
+        if number is not None:
+            return number
+        mmu = self._kernel.hardware.mmu
+        number = self.lowestClassFrame(mmu.referenceBits, mmu.modifiedBits)
+        self._hand = (number + 1) % self._numberOfFrames
+        mmu.clearReferenceBits(self._numberOfFrames)
+        return number
 
-    def getFrame(self):
-        if self._freeFrames:
-            number = self._freeFrames.pop(0)
+    def lowestClassFrame(self, referenceBits, modifiedBits):
+        best = None
+        bestClass = 4
+        for i in range(self._numberOfFrames):
+            frame = (self._hand + i) % self._numberOfFrames
+            frameClass = 2 * referenceBits[frame] + modifiedBits[frame]
+            if frameClass < bestClass:
+                best = frame
+                bestClass = frameClass
+                if frameClass == 0:
+                    break
+        return best
+
+## ARC, 2Q y CLOCK-Pro resisten recorridos secuenciales distinguiendo las paginas usadas
+## una sola vez de las reusadas. Como los programas no tienen saltos, un proceso nunca
+## vuelve a una pagina que dejo: los bits de referencia que prende el fetch son de la
+## misma corrida de instrucciones (que el scheduler puede partir en varios quantums).
+## El reuso real es que otro proceso del mismo programa mapee una pagina ya cargada
+## (pageReused) o que vuelva a hacer fault una pagina desalojada hace poco
+
+## ARC (Megiddo y Modha): T1 tiene las paginas usadas una vez y T2 las reusadas, ambas en
+## orden LRU; B1 y B2 recuerdan las paginas desalojadas de cada una (sin frame). Un fault
+## sobre una pagina de B1 agranda p, el tamaño objetivo de T1, y uno sobre B2 lo achica
+class ArcAlgorithm(AbstractAlgorithm):
+    def __init__(self, kernel):
+        super().__init__(kernel)
+        self._t1 = OrderedDict()
+        self._t2 = OrderedDict()
+        self._b1 = OrderedDict()
+        self._b2 = OrderedDict()
+        self._p = 0
+
+    @property
+    def target(self):
+        return self._p
+
+    def getFrame(self, pageKey = None):
+        c = self._numberOfFrames
+        if pageKey in self._b1:
+            self._p = min(c, self._p + max(1, len(self._b2) / len(self._b1)))
+            del self._b1[pageKey]
+            number = self.takeFrame(False)
+            self._t2[number] = pageKey
+        elif pageKey in self._b2:
+            self._p = max(0, self._p - max(1, len(self._b1) / len(self._b2)))
+            del self._b2[pageKey]
+            number = self.takeFrame(True)
+            self._t2[number] = pageKey
         else:
-            self.updateReferenceBit()
-            while self._usedFrames[self._needle][0]:
-                self._usedFrames[self._needle][0] = False
-                self.moveNeedle()
+            number = self.takeFrame(False)
+            self._t1[number] = pageKey
+        ## los fantasmas no pasan de c paginas en T1+B1 ni de 2c en total
+        while self._b1 and len(self._t1) + len(self._b1) > c:
+            self._b1.popitem(last = False)
+        while self._b2 and len(self._t1) + len(self._t2) + len(self._b1) + len(self._b2) > 2 * c:
+            self._b2.popitem(last = False)
+        return number
 
-            pcb = self._usedFrames[self._needle][1]
-            self.updatePageTable(pcb, self._needle)
+    ## un uso de una pagina en memoria la pasa al final (MRU) de T2
+    def pageReused(self, frameNumber):
+        if frameNumber in self._t1:
+            self._t2[frameNumber] = self._t1.pop(frameNumber)
+        elif frameNumber in self._t2:
+            self._t2.move_to_end(frameNumber)
+
+    def takeFrame(self, inB2):
+        number = self._frameAllocator.allocate()
+        if number is not None:
+            return number
+        if self._t1 and (len(self._t1) > self._p or (inB2 and len(self._t1) == self._p) or not self._t2):
+            number, pageKey = self._t1.popitem(last = False)
+            self._b1[pageKey] = None
+        else:
+            number, pageKey = self._t2.popitem(last = False)
+            self._b2[pageKey] = None
+        return number
 
-            number = self._needle
-            self.moveNeedle()
-        self._usedFrames[number] = [True, self._kernel.pcbTable.runningPcb]
+    def setFreeFrame(self, frameNumber):
+        self._t1.pop(frameNumber, None)
+        self._t2.pop(frameNumber, None)
+        self._frameAllocator.free(frameNumber)
+
+    def setFreeFrames(self, frameNumbers):
+        for frameNumber in frameNumbers:
+            self.setFreeFrame(frameNumber)
+
+## 2Q (Johnson y Shasha): las paginas nuevas entran a A1in, una FIFO de a lo sumo un
+## cuarto de los frames; las que salen de A1in se recuerdan en A1out (sin frame, hasta
+## la mitad de los frames). Solo una pagina que vuelve a hacer fault estando en A1out
+## pasa a Am, que se maneja como LRU; los usos de paginas de A1in no cuentan
+class TwoQAlgorithm(AbstractAlgorithm):
+    def __init__(self, kernel):
+        super().__init__(kernel)
+        self._kin = max(1, self._numberOfFrames // 4)
+        self._kout = max(1, self._numberOfFrames // 2)
+        self._a1in = OrderedDict()
+        self._a1out = OrderedDict()
+        self._am = OrderedDict()
+
+    def getFrame(self, pageKey = None):
+        number = self._frameAllocator.allocate()
+        if number is None:
+            number = self.reclaimFrame()
+        if pageKey in self._a1out:
+            del self._a1out[pageKey]
+            self._am[number] = pageKey
+        else:
+            self._a1in[number] = pageKey
         return number
 
+    def pageReused(self, frameNumber):
+        if frameNumber in self._am:
+            self._am.move_to_end(frameNumber)
+
+    def reclaimFrame(self):
+        if len(self._a1in) > self._kin or not self._am:
+            number, pageKey = self._a1in.popitem(last = False)
+            self._a1out[pageKey] = None
+            if len(self._a1out) > self._kout:
+                self._a1out.popitem(last = False)
+            return number
+        return self._am.popitem(last = False)[0]
+
     def setFreeFrame(self, frameNumber):
-        self.updateReferenceBit()
-        self._freeFrames.append(frameNumber)
-        self._usedFrames[frameNumber] = [True, None]
+        self._a1in.pop(frameNumber, None)
+        self._am.pop(frameNumber, None)
+        self._frameAllocator.free(frameNumber)
+
+    def setFreeFrames(self, frameNumbers):
+        for frameNumber in frameNumbers:
+            self.setFreeFrame(frameNumber)
+
+## una entrada del reloj de CLOCK-Pro: una pagina caliente o fria en memoria, o una
+## pagina fria desalojada que sigue en su periodo de prueba (sin frame)
+class ClockProPage():
+    def __init__(self, pageKey, frameNumber, hot):
+        self.pageKey = pageKey
+        self.frameNumber = frameNumber
+        self.hot = hot
+        self.referenced = False
+        self.prev = self
+        self.next = self
+
+## CLOCK-Pro (Jiang, Chen y Zhang): todas las paginas estan en un reloj que recorren tres
+## agujas. La fria vuelve calientes las paginas frias reusadas y desaloja las otras, que
+## quedan en prueba sin frame; la caliente enfria las calientes no reusadas; la de prueba
+## termina los periodos de prueba. Un fault sobre una pagina en prueba la trae caliente y
+## agranda coldTarget, la cantidad objetivo de frames para paginas frias; cuando una
+## prueba termina sin reuso, coldTarget se achica
+class ClockProAlgorithm(AbstractAlgorithm):
+    def __init__(self, kernel):
+        super().__init__(kernel)
+        self._pages = dict()
+        self._frames = dict()
+        self._handHot = None
+        self._handCold = None
+        self._handTest = None
+        self._hotCount = 0
+        self._coldCount = 0
+        self._testCount = 0
+        self._coldTarget = 1
+        ## frames que las agujas liberaron de mas y todavia no se entregaron
+        self._released = []
 
-    def updateReferenceBit(self):
-        uses = HARDWARE.mmu.getUses()
-        for f in uses:
-            self._usedFrames[f][0] = True
+    @property
+    def coldTarget(self):
+        return self._coldTarget
+
+    def getFrame(self, pageKey = None):
+        testPage = self._pages.get(pageKey)
+        if testPage is not None:
+            ## fault durante el periodo de prueba: se reuso "pronto", entra caliente
+            self._coldTarget = min(max(1, self._numberOfFrames - 1), self._coldTarget + 1)
+            self.remove(testPage)
+            self._testCount -= 1
+        while not self._released and self._hotCount + self._coldCount >= self._numberOfFrames:
+            self.runHandCold()
+        number = self._released.pop() if self._released else self._frameAllocator.allocate()
+        page = ClockProPage(pageKey, number, testPage is not None)
+        if page.hot:
+            self._hotCount += 1
+        else:
+            self._coldCount += 1
+        self.insert(page)
+        self._frames[number] = page
+        return number
 
-    def moveNeedle(self):
-        self._needle = (self._needle + 1) % len(self._usedFrames)
+    def pageReused(self, frameNumber):
+        self._frames[frameNumber].referenced = True
+
+    ## si la pagina se reuso desde la ultima vez que paso una aguja (y lo olvida)
+    def referenced(self, page):
+        referenced = page.referenced
+        page.referenced = False
+        return referenced
+
+    ## la pagina nueva queda justo antes de la aguja caliente, la ultima posicion que visitan
+    def insert(self, page):
+        self._pages[page.pageKey] = page
+        if self._handHot is None:
+            self._handHot = self._handCold = self._handTest = page
+            return
+        last = self._handHot.prev
+        page.prev = last
+        page.next = self._handHot
+        last.next = page
+        self._handHot.prev = page
+
+    def remove(self, page):
+        del self._pages[page.pageKey]
+        following = None if page.next is page else page.next
+        if self._handHot is page:
+            self._handHot = following
+        if self._handCold is page:
+            self._handCold = following
+        if self._handTest is page:
+            self._handTest = following
+        page.prev.next = page.next
+        page.next.prev = page.prev
+
+    def runHandCold(self):
+        page = self._handCold
+        self._handCold = page.next
+        if not page.hot and page.frameNumber is not None:
+            if self.referenced(page):
+                page.hot = True
+                self._coldCount -= 1
+                self._hotCount += 1
+            else:
+                del self._frames[page.frameNumber]
+                self._released.append(page.frameNumber)
+                page.frameNumber = None
+                self._coldCount -= 1
+                self._testCount += 1
+                while self._testCount > self._numberOfFrames:
+                    self.runHandTest()
+        while self._hotCount > self._numberOfFrames - self._coldTarget:
+            self.runHandHot()
+
+    def runHandHot(self):
+        if self._handHot is self._handTest:
+            self.runHandTest()
+        page = self._handHot
+        self._handHot = page.next
+        if page.hot and not self.referenced(page):
+            page.hot = False
+            self._hotCount -= 1
+            self._coldCount += 1
+
+    def runHandTest(self):
+        if self._handTest is self._handCold:
+            self.runHandCold()
+        page = self._handTest
+        self._handTest = page.next
+        if page.frameNumber is None:
+            self.remove(page)
+            self._testCount -= 1
+            self._coldTarget = max(1, self._coldTarget - 1)
+
+    def setFreeFrame(self, frameNumber):
+        if frameNumber in self._released:
+            self._released.remove(frameNumber)
+        else:
+            page = self._frames.pop(frameNumber)
+            if page.hot:
+                self._hotCount -= 1
+            else:
+                self._coldCount -= 1
+            self.remove(page)
+        self._frameAllocator.free(frameNumber)
+
+    def setFreeFrames(self, frameNumbers):
+        for frameNumber in frameNumbers:
+            self.setFreeFrame(frameNumber)
 
 class AbstractScheduler:
 
-    def __init__(self):
+    def __init__(self, hardware):
+        self._hardware = hardware
         self.__readyQ = []
 
     @property
@@ -194,64 +711,502 @@ class AbstractScheduler:
         pcb.state = ProcessState.READY
         self.readyQ.append(pcb)
 
-    def getNext(self):
+    ## core es el procesador que pide trabajo (los schedulers con una sola cola lo ignoran)
+    def getNext(self, core = 0):
         return self.readyQ.pop(0)
 
-    def hasNext(self):
+    def hasNext(self, core = 0):
         return len(self.readyQ) != 0
 
+    def readyCount(self):
+        return len(self.readyQ)
+
     def mustExpropiate(self, pcbInCPU, pcbToAdd):
         return False
 
+    ## el kernel que usa el scheduler (para los que necesitan, por ejemplo, su FileSystem)
+    def attach(self, kernel):
+        pass
+
+    ## si se acepta un trabajo con ese deadline (ticks desde ahora) y periodo (ver Kernel.run)
+    def admit(self, program, deadline, period = None, releases = 1):
+        return True
+
+    ## el proceso va a correr en core: los schedulers con un quantum propio programan el Timer
+    def programTimer(self, pcb, core):
+        pass
+
+    ## el proceso uso todo su quantum
+    def quantumExpired(self, pcb):
+        pass
+
+    ## el proceso deja el CPU de core (o se le renueva el quantum): corrio lo que
+    ## cuenta el Timer de ese core desde que se despacho
+    def charge(self, pcb, core):
+        pass
+
+    ## el proceso dejo el CPU para hacer IO
+    def blocked(self, pcb):
+        pass
+
+    ## estadisticas propias del scheduler
+    def stats(self):
+        return dict()
+
 
 class SchedulerFCFS(AbstractScheduler):
     pass
 
 
+## prioridad 0 es la mayor y puede haber cualquier cantidad de niveles. Cada agingTicks
+## ticks en la cola un proceso sube un nivel (aging). En vez de recorrer las colas en cada
+## tick, la clave del heap es el tick en que el proceso llegaria a prioridad 0:
+## priority * agingTicks + tick en que se encolo. En cualquier tick, dos procesos quedan
+## en el mismo orden que sus prioridades envejecidas (y entre iguales, el que llego antes)
 class SchedulerPriority(AbstractScheduler):
-    def __init__(self):
-        super().__init__()
-        self.readyQ = [[], [], [], [], []]
+    def __init__(self, hardware, agingTicks = 3):
+        super().__init__(hardware)
+        self._agingTicks = agingTicks
+        ## desempata claves iguales por orden de llegada (y evita comparar pcbs)
+        self._sequence = 0
+
+    def add(self, pcb):
+        pcb.state = ProcessState.READY
+        key = pcb.priority * self._agingTicks + self._hardware.clock.currentTick
+        heappush(self.readyQ, (key, self._sequence, pcb))
+        self._sequence += 1
+
+    def getNext(self, core = 0):
+        if not self.readyQ:
+            return None
+        key, sequence, pcb = heappop(self.readyQ)
+        priority = self.agedPriority(key)
+        if priority < pcb.priority:
+            log.logger.info("New priority {prio} for {pcb}".format(prio=priority, pcb=pcb))
+        return pcb
+
+    ## prioridad envejecida, ahora, de un proceso encolado con esa clave
+    def agedPriority(self, key):
+        return max(0, -((self._hardware.clock.currentTick - key) // self._agingTicks))
+
+
+class SchedulerPriorityPRENTIVE(SchedulerPriority):
+
+    def mustExpropiate(self, pcbInCPU, pcbToAdd):
+        return pcbToAdd.priority < pcbInCPU.priority
+
+
+class SchedulerRoundRobin(AbstractScheduler):
+
+    def __init__(self, hardware):
+        super().__init__(hardware)
+        for timer in self._hardware.timers:
+            timer.quantum = 3
+
+
+## MLFQ: una cola round robin por nivel, el nivel 0 es el de mayor prioridad y el de
+## quantum mas corto. Todos los procesos empiezan en el nivel 0; el que usa todo su
+## quantum baja un nivel y el que deja el CPU para hacer IO sube uno, asi los procesos
+## interactivos quedan arriba y los que solo usan CPU se van abajo. Cada boostPeriod ticks
+## todos vuelven al nivel 0 para que los de abajo no sufran inanicion (el boost se
+## aplica en la primera decision del scheduler despues del periodo, sin suscribirse al reloj)
+class SchedulerMLFQ(AbstractScheduler):
+
+    def __init__(self, hardware, quanta = (2, 4, 8), boostPeriod = 50):
+        super().__init__(hardware)
+        self._quanta = quanta
+        self._boostPeriod = boostPeriod
+        self._lastBoost = 0
+        self.readyQ = [[] for quantum in quanta]
         self.__pcbCount = 0
-        HARDWARE.clock.addSubscriber(self)
+        ## procesos que no estan en el nivel 0 (los que hay que subir en un boost)
+        self._demoted = set()
+        self._demotions = 0
+        self._promotions = 0
+        self._boosts = 0
+
+    def level(self, pcb):
+        return pcb.schedulingLevel or 0
+
+    def setLevel(self, pcb, level):
+        pcb.schedulingLevel = level
+        if level == 0:
+            self._demoted.discard(pcb)
+        else:
+            self._demoted.add(pcb)
 
     def add(self, pcb):
+        self.boostIfDue()
         pcb.state = ProcessState.READY
-        self.readyQ[pcb.priority].append((pcb, HARDWARE.clock.currentTick))
+        self.readyQ[self.level(pcb)].append(pcb)
         self.__pcbCount += 1
 
-    def getNext(self):
-        index = 0
-        next = None
-        while not self.readyQ[index] and index < 4:
-            index += 1
-        if self.readyQ[index]:
-            next = self.readyQ[index].pop(0)[0]
-            self.__pcbCount -= 1
-        return next
+    def getNext(self, core = 0):
+        self.boostIfDue()
+        for queue in self.readyQ:
+            if queue:
+                self.__pcbCount -= 1
+                return queue.pop(0)
+        return None
 
-    def hasNext(self):
+    def hasNext(self, core = 0):
         return self.__pcbCount != 0
 
-    def tick(self, nmrTick):
-        for i in range(1, 5):
-            while self.readyQ[i] and nmrTick - self.readyQ[i][0][1] >= 3:
-                elementToAge = self.readyQ[i].pop()
-                self.readyQ[i - 1].append((elementToAge[0], nmrTick))
-                log.logger.info("New priority {prio} for {pcb}".format(prio=i - 1, pcb=elementToAge[0]))
+    def readyCount(self):
+        return self.__pcbCount
 
+    ## un proceso de un nivel mas alto expropia al que esta corriendo
+    def mustExpropiate(self, pcbInCPU, pcbToAdd):
+        self.boostIfDue()
+        return self.level(pcbToAdd) < self.level(pcbInCPU)
+
+    def programTimer(self, pcb, core):
+        self._hardware.timers[core].quantum = self._quanta[self.level(pcb)]
+
+    def quantumExpired(self, pcb):
+        self.boostIfDue()
+        level = self.level(pcb)
+        if level < len(self._quanta) - 1:
+            self.setLevel(pcb, level + 1)
+            self._demotions += 1
+            log.logger.info("{pcb} demoted to level {level}".format(pcb=pcb, level=level + 1))
+
+    def blocked(self, pcb):
+        self.boostIfDue()
+        level = self.level(pcb)
+        if level > 0:
+            self.setLevel(pcb, level - 1)
+            self._promotions += 1
+
+    def boostIfDue(self):
+        tick = self._hardware.clock.currentTick
+        if tick - self._lastBoost < self._boostPeriod:
+            return
+        self._lastBoost = tick - (tick - self._lastBoost) % self._boostPeriod
+        if not self._demoted:
+            return
+        for pcb in self._demoted:
+            pcb.schedulingLevel = 0
+        self._demoted.clear()
+        self.readyQ = [[pcb for queue in self.readyQ for pcb in queue]] + [[] for quantum in self._quanta[1:]]
+        self._boosts += 1
+        log.logger.info("Priority boost")
 
-class SchedulerPriorityPRENTIVE(SchedulerPriority):
+    def stats(self):
+        return {'demotions': self._demotions,
+                'promotions': self._promotions,
+                'boosts': self._boosts}
+
+
+## peso de cada prioridad en el reparto proporcional del CPU: como con los nice de Linux,
+## cada nivel de prioridad recibe 1.25 veces mas CPU que el siguiente
+def priorityWeight(priority):
+    return 1024 / 1.25 ** priority
+
+
+## CFS: los procesos se ordenan por vruntime, el tiempo que corrieron (contado por el
+## Timer) dividido por el peso de su prioridad, y siempre corre el que menos tiene. El
+## quantum reparte targetLatency entre los procesos listos, sin bajar de minGranularity,
+## y se achica en los Timers que ya estan corriendo cuando llegan mas procesos.
+## Un proceso nuevo, o que vuelve de un IO, arranca cerca del minimo vruntime de la cola
+## para no acaparar el CPU con el credito acumulado, y expropia al que esta corriendo si
+## este ya lleva mas de wakeupGranularity de vruntime de ventaja
+class SchedulerCFS(AbstractScheduler):
+
+    def __init__(self, hardware, targetLatency = 12, minGranularity = 2, wakeupGranularity = 2):
+        super().__init__(hardware)
+        self._targetLatency = targetLatency
+        self._minGranularity = minGranularity
+        self._wakeupGranularity = wakeupGranularity
+        self._minVruntime = 0
+        ## desempata vruntimes iguales por orden de llegada (y evita comparar pcbs)
+        self._sequence = 0
+
+    ## vruntime con el que entra a la cola un proceso que estaba afuera
+    def placedVruntime(self, pcb):
+        if pcb.vruntime is None:
+            return self._minVruntime
+        return max(pcb.vruntime, self._minVruntime - self._targetLatency / 2)
+
+    ## vruntime de un proceso que esta corriendo, contando lo que lleva en este quantum
+    def currentVruntime(self, pcb):
+        return pcb.vruntime + self.weighted(pcb, self._hardware.timers[pcb.lastCore].tickCount)
+
+    def weighted(self, pcb, ticks):
+        return ticks * priorityWeight(0) / priorityWeight(pcb.priority)
+
+    def add(self, pcb):
+        pcb.state = ProcessState.READY
+        pcb.vruntime = self.placedVruntime(pcb)
+        heappush(self.readyQ, (pcb.vruntime, self._sequence, pcb))
+        self._sequence += 1
+        for timer in self._hardware.timers:
+            timer.quantum = min(timer.quantum, self.timeslice())
+
+    def getNext(self, core = 0):
+        if not self.readyQ:
+            return None
+        vruntime, sequence, pcb = heappop(self.readyQ)
+        self._minVruntime = max(self._minVruntime, vruntime)
+        return pcb
+
+    ## un proceso nuevo puede despacharse en un core libre sin pasar por la cola
+    def programTimer(self, pcb, core):
+        if pcb.vruntime is None:
+            pcb.vruntime = self._minVruntime
+        self._hardware.timers[core].quantum = self.timeslice()
+
+    def timeslice(self):
+        return max(self._minGranularity, self._targetLatency // (len(self.readyQ) + 1))
 
     def mustExpropiate(self, pcbInCPU, pcbToAdd):
-        return pcbToAdd.priority < pcbInCPU.priority
+        return self.placedVruntime(pcbToAdd) + self._wakeupGranularity < self.currentVruntime(pcbInCPU)
 
+    def charge(self, pcb, core):
+        pcb.vruntime += self.weighted(pcb, self._hardware.timers[core].tickCount)
 
-class SchedulerRoundRobin(AbstractScheduler):
+    def stats(self):
+        return {'minVruntime': self._minVruntime}
 
-    def __init__(self):
-        super().__init__()
-        HARDWARE.timer.quantum = 3
+
+## prediccion exacta de las rafagas: se leen de la imagen del programa en el FileSystem
+class ImageBurstPredictor():
+
+    def __init__(self, fileSystem):
+        self._fileSystem = fileSystem
+
+    ## ticks que le faltan a la rafaga del proceso, que esta en pc y ya corrio "running"
+    ## ticks desde que se despacho (pc ya los tiene en cuenta)
+    def remaining(self, pcb, pc, running = 0):
+        return self._fileSystem.getProgram(pcb.path).burstLength(pc)
+
+    def charge(self, pcb, ticks):
+        pass
+
+    def burstEnded(self, pcb):
+        pass
+
+
+## prediccion de caja negra: promedio exponencial de las rafagas anteriores de cada
+## proceso, estimate = alpha * ultima rafaga + (1 - alpha) * estimate
+class ExponentialBurstPredictor():
+
+    def __init__(self, alpha = 0.5, initialEstimate = 5):
+        self._alpha = alpha
+        self._initialEstimate = initialEstimate
+        ## pid -> rafaga estimada y ticks que lleva corridos la rafaga actual
+        self._estimates = dict()
+        self._progress = dict()
+
+    def estimate(self, pcb):
+        return self._estimates.get(pcb.pid, self._initialEstimate)
+
+    def remaining(self, pcb, pc, running = 0):
+        return max(0, self.estimate(pcb) - self._progress.get(pcb.pid, 0) - running)
+
+    def charge(self, pcb, ticks):
+        self._progress[pcb.pid] = self._progress.get(pcb.pid, 0) + ticks
+
+    def burstEnded(self, pcb):
+        burst = self._progress.pop(pcb.pid, 0)
+        self._estimates[pcb.pid] = self._alpha * burst + (1 - self._alpha) * self.estimate(pcb)
+
+
+## SJF: corre el proceso al que le falta menos para terminar su rafaga de CPU. Sin un
+## predictor se usa la imagen del programa (ImageBurstPredictor) del kernel
+class SchedulerSJF(AbstractScheduler):
+
+    def __init__(self, hardware, predictor = None):
+        super().__init__(hardware)
+        self._predictor = predictor
+        ## desempata rafagas iguales por orden de llegada (y evita comparar pcbs)
+        self._sequence = 0
+
+    def attach(self, kernel):
+        if self._predictor is None:
+            self._predictor = ImageBurstPredictor(kernel.fileSystem)
+
+    def add(self, pcb):
+        pcb.state = ProcessState.READY
+        heappush(self.readyQ, (self._predictor.remaining(pcb, pcb.pc), self._sequence, pcb))
+        self._sequence += 1
+
+    def getNext(self, core = 0):
+        if not self.readyQ:
+            return None
+        return heappop(self.readyQ)[2]
+
+    def charge(self, pcb, core):
+        self._predictor.charge(pcb, self._hardware.timers[core].tickCount)
+
+    def blocked(self, pcb):
+        self._predictor.burstEnded(pcb)
+
+
+## SRTF: SJF expropiativo, un proceso con una rafaga mas corta que lo que le falta
+## al que esta corriendo lo expropia
+class SchedulerSRTF(SchedulerSJF):
+
+    def mustExpropiate(self, pcbInCPU, pcbToAdd):
+        core = pcbInCPU.lastCore
+        remaining = self._predictor.remaining(pcbInCPU, self._hardware.cpus[core].pc, self._hardware.timers[core].tickCount)
+        return self._predictor.remaining(pcbToAdd, pcbToAdd.pc) < remaining
+
+
+## EDF: corre el proceso con el deadline mas cercano, y uno que llega con un deadline
+## anterior al del que esta corriendo lo expropia. Los procesos sin deadline corren
+## solo cuando no queda ninguno con deadline
+class SchedulerEDF(AbstractScheduler):
+
+    def __init__(self, hardware):
+        super().__init__(hardware)
+        self._kernel = None
+        ## desempata deadlines iguales por orden de llegada (y evita comparar pcbs)
+        self._sequence = 0
+        ## tareas periodicas admitidas: (utilizacion, tick en que vence su ultima instancia)
+        self._tasks = []
+
+    def attach(self, kernel):
+        self._kernel = kernel
+
+    def deadline(self, pcb):
+        return math.inf if pcb.deadline is None else pcb.deadline
+
+    def add(self, pcb):
+        pcb.state = ProcessState.READY
+        heappush(self.readyQ, (self.deadline(pcb), self._sequence, pcb))
+        self._sequence += 1
+
+    def getNext(self, core = 0):
+        if not self.readyQ:
+            return None
+        return heappop(self.readyQ)[2]
+
+    def mustExpropiate(self, pcbInCPU, pcbToAdd):
+        return self.deadline(pcbToAdd) < self.deadline(pcbInCPU)
+
+    ## test de admision, contando cada instruccion como un tick de CPU (sin el tiempo de
+    ## los dispositivos). Una tarea periodica no puede pasar la utilizacion de los cores
+    ## junto con las ya admitidas. Ademas, ordenando por deadline los trabajos vivos con
+    ## el nuevo, lo que falta correr hasta cada deadline desde el nuevo tiene que entrar
+    ## en los ticks que quedan hasta ese deadline (es exacto con un solo core)
+    def admit(self, program, deadline, period = None, releases = 1):
+        if deadline is None:
+            return True
+        now = self._hardware.clock.currentTick
+        cores = self._hardware.coresCount
+        cost = self._kernel.fileSystem.programSize(program)
+        if period is not None:
+            self._tasks = [task for task in self._tasks if task[1] > now]
+            utilization = cost / min(deadline, period)
+            if sum(task[0] for task in self._tasks) + utilization > cores:
+                return False
+        jobs = [(pcb.deadline, False, self.remainingCost(pcb)) for pcb in self._kernel.pcbTable.getPcbs()
+                if pcb.deadline is not None and pcb.state != ProcessState.TERMINATED]
+        jobs.append((now + deadline, True, cost))
+        jobs.sort()
+        demand = 0
+        checking = False
+        for absoluteDeadline, isNew, remaining in jobs:
+            demand += remaining
+            checking = checking or isNew
+            if checking and demand > (absoluteDeadline - now) * cores:
+                return False
+        if period is not None:
+            self._tasks.append((utilization, now + (releases - 1) * period + deadline))
+        return True
+
+    def remainingCost(self, pcb):
+        return self._kernel.fileSystem.programSize(pcb.path) - pcb.pc
+
+
+## scheduler SMP: una cola de listos por core, cada una con la politica de schedulerClass.
+## Un proceso vuelve a la cola del ultimo core donde corrio (donde la MMU todavia tiene
+## sus paginas) salvo que esa cola tenga mas de "imbalance" procesos que la menos cargada,
+## y un core que se queda sin trabajo le roba a la cola mas cargada
+class SchedulerPerCore(AbstractScheduler):
+
+    def __init__(self, hardware, schedulerClass = SchedulerFCFS, imbalance = 2):
+        super().__init__(hardware)
+        self.readyQ = [schedulerClass(hardware) for core in range(hardware.coresCount)]
+        self._imbalance = imbalance
+        self._enqueuedAt = dict()
+        self._steals = 0
+        ## [ticks esperando en la cola, cantidad de procesos despachados]
+        self._localLatency = [0, 0]
+        self._stolenLatency = [0, 0]
+
+    def leastLoadedCore(self):
+        return min(range(len(self.readyQ)), key=lambda core: self.readyQ[core].readyCount())
+
+    def busiestCore(self):
+        return max(range(len(self.readyQ)), key=lambda core: self.readyQ[core].readyCount())
+
+    def add(self, pcb):
+        core = self.leastLoadedCore()
+        if pcb.lastCore is not None and \
+                self.readyQ[pcb.lastCore].readyCount() <= self.readyQ[core].readyCount() + self._imbalance:
+            core = pcb.lastCore
+        self._enqueuedAt[pcb.pid] = self._hardware.clock.currentTick
+        self.readyQ[core].add(pcb)
+
+    def getNext(self, core = 0):
+        queue = self.readyQ[core]
+        latency = self._localLatency
+        if not queue.hasNext():
+            queue = self.readyQ[self.busiestCore()]
+            latency = self._stolenLatency
+            self._steals += 1
+            log.logger.info("Core {core} steals work".format(core=core))
+        pcb = queue.getNext(core)
+        latency[0] += self._hardware.clock.currentTick - self._enqueuedAt.pop(pcb.pid)
+        latency[1] += 1
+        return pcb
+
+    def hasNext(self, core = 0):
+        for queue in self.readyQ:
+            if queue.hasNext():
+                return True
+        return False
+
+    def readyCount(self):
+        return sum(queue.readyCount() for queue in self.readyQ)
+
+    def mustExpropiate(self, pcbInCPU, pcbToAdd):
+        return self.readyQ[0].mustExpropiate(pcbInCPU, pcbToAdd)
+
+    def attach(self, kernel):
+        for queue in self.readyQ:
+            queue.attach(kernel)
+
+    def admit(self, program, deadline, period = None, releases = 1):
+        return self.readyQ[0].admit(program, deadline, period, releases)
+
+    def programTimer(self, pcb, core):
+        self.readyQ[core].programTimer(pcb, core)
+
+    ## el proceso acaba de correr en pcb.lastCore
+    def quantumExpired(self, pcb):
+        self.readyQ[pcb.lastCore].quantumExpired(pcb)
+
+    def blocked(self, pcb):
+        self.readyQ[pcb.lastCore].blocked(pcb)
+
+    def charge(self, pcb, core):
+        self.readyQ[core].charge(pcb, core)
+
+    def averageLatency(self, latency):
+        if latency[1] == 0:
+            return 0
+        return latency[0] / latency[1]
+
+    def stats(self):
+        local = self.averageLatency(self._localLatency)
+        stolen = self.averageLatency(self._stolenLatency)
+        return {'steals': self._steals,
+                'avgLocalLatency': local,
+                'avgStolenLatency': stolen,
+                'extraStealLatency': stolen - local if self._stolenLatency[1] else 0}
 
 
 ## emulates an Input/Output device controller (driver)
@@ -261,6 +1216,7 @@ class IoDeviceController:
         self._device = device
         self._waiting_queue = []
         self._currentPCB = None
+        self._currentOperation = None
 
     def runOperation(self, pcb, instruction):
         pair = {'pcb': pcb, 'instruction': instruction}
@@ -275,6 +1231,11 @@ class IoDeviceController:
         self.__load_from_waiting_queue_if_apply()
         return finishedPCB
 
+    ## la operacion que esta ejecutando el dispositivo (para el pcb que retorna getFinishedPCB)
+    @property
+    def currentOperation(self):
+        return self._currentOperation
+
     def __load_from_waiting_queue_if_apply(self):
         if (len(self._waiting_queue) > 0) and self._device.is_idle:
             ## pop(): extracts (deletes and return) the first element in queue
@@ -283,6 +1244,7 @@ class IoDeviceController:
             pcb = pair['pcb']
             instruction = pair['instruction']
             self._currentPCB = pcb
+            self._currentOperation = instruction
             self._device.execute(instruction)
 
     def __repr__(self):
@@ -294,6 +1256,12 @@ class StatTable():
     def __init__(self, kernel):
         self.__kernel = kernel
         self.__stats = []
+        self.__pageFaults = 0
+        self.__swapIns = 0
+        self.__completions = [0] * kernel.hardware.coresCount
+        ## pid -> tick en que termino, y programas que el scheduler no admitio
+        self.__finishTicks = dict()
+        self.__rejections = []
 
     @property
     def stats(self):
@@ -302,6 +1270,79 @@ class StatTable():
     def addStat(self, stat):
         self.__stats.append(stat)
 
+    @property
+    def pageFaults(self):
+        return self.__pageFaults
+
+    def addPageFault(self):
+        self.__pageFaults += 1
+
+    ## page faults que tuvieron que esperar al disco de swap
+    @property
+    def swapIns(self):
+        return self.__swapIns
+
+    def addSwapIn(self):
+        self.__swapIns += 1
+
+    ## registra que un proceso termino en el core indicado
+    def addCompletion(self, core, pcb):
+        self.__completions[core] += 1
+        ## termina al final del tick en que ejecuta el EXIT
+        self.__finishTicks[pcb.pid] = self.__kernel.hardware.clock.currentTick + 1
+
+    def addRejection(self, program):
+        self.__rejections.append(program)
+
+    ## por cada proceso con deadline: cuando termino (None si no termino) y su retraso
+    ## (lateness, negativo si termino antes); uno sin terminar cuenta el retraso hasta ahora
+    def deadlineResults(self):
+        results = []
+        now = self.__kernel.hardware.clock.currentTick + 1
+        for pcb in self.__kernel.pcbTable.getPcbs():
+            if pcb.deadline is None:
+                continue
+            finish = self.__finishTicks.get(pcb.pid)
+            lateness = (now if finish is None else finish) - pcb.deadline
+            results.append({'pid': pcb.pid,
+                            'path': pcb.path,
+                            'deadline': pcb.deadline,
+                            'finish': finish,
+                            'lateness': lateness,
+                            'missed': lateness > 0})
+        return results
+
+    def deadlineStats(self):
+        results = self.deadlineResults()
+        lateness = [result['lateness'] for result in results]
+        return {'deadlineJobs': len(results),
+                'deadlineMisses': sum(1 for result in results if result['missed']),
+                'maxLateness': max(lateness) if lateness else 0,
+                'avgLateness': self.avgTime(lateness) if lateness else 0,
+                'rejected': len(self.__rejections)}
+
+    ## migraciones entre cores mas las estadisticas propias del scheduler
+    def schedulingStats(self):
+        stats = {'migrations': self.__kernel.dispatcher.migrations}
+        stats.update(self.__kernel.scheduler.stats())
+        return stats
+
+    ## utilizacion y throughput (instrucciones y procesos terminados por tick) de cada core
+    def coreStats(self):
+        stats = []
+        for core, cpu in enumerate(self.__kernel.hardware.cpus):
+            completions = self.__completions[core]
+            tlb = self.__kernel.hardware.mmus[core].tlb
+            stats.append({'core': core,
+                          'utilization': cpu.utilization,
+                          'instructionsPerTick': cpu.throughput,
+                          'completed': completions,
+                          'completedPerTick': completions / cpu.ticks if cpu.ticks else 0,
+                          'tlbHits': tlb.hits,
+                          'tlbMisses': tlb.misses,
+                          'tlbFlushes': tlb.flushes})
+        return stats
+
     def convertToWaitingTime(self, state):
         if state == '.':
             return 1
@@ -317,22 +1358,54 @@ class StatTable():
     def avgTime(self, list):
         return sum(list) / len(list)
 
+    ## indice de equidad de Jain (1 = reparto perfecto, 1/n = uno se llevo todo) del
+    ## servicio que recibio cada proceso sobre el que le correspondia. En cada tick con
+    ## mas de un proceso listo o corriendo, a cada uno le corresponde una parte de los
+    ## cores ocupados: la misma para todos o, con weighted, proporcional al peso de su prioridad
+    def fairnessIndex(self, weighted = False):
+        pcbs = list(self.__kernel.pcbTable.getPcbs())
+        received = [0] * len(pcbs)
+        entitled = [0] * len(pcbs)
+        for stat in self.stats:
+            runnable = [index for index, e in enumerate(stat) if e == 'R' or e == '.']
+            if len(runnable) < 2:
+                continue
+            weights = [priorityWeight(pcbs[index].priority) if weighted else 1 for index in runnable]
+            busyCores = sum(1 for index in runnable if stat[index] == 'R')
+            for index, weight in zip(runnable, weights):
+                entitled[index] += busyCores * weight / sum(weights)
+                if stat[index] == 'R':
+                    received[index] += 1
+        shares = [received[index] / entitled[index] for index in range(len(pcbs)) if entitled[index]]
+        squares = sum(share * share for share in shares)
+        if not squares:
+            return 1
+        return sum(shares) ** 2 / (len(shares) * squares)
+
     ## Returns a tuple with average waiting time, and
     ## the waiting time of each process
     def waitingTimes(self):
         processesNumber = self.__kernel.pcbTable.pcbCount()
         processesWaitingTime = [0] * processesNumber
         processesReturnTime = [0] * processesNumber
+        ## tiempo de respuesta: ticks hasta que el proceso corre por primera vez
+        processesResponseTime = [0] * processesNumber
+        started = [False] * processesNumber
         for stat in self.stats:
             for index, e in enumerate(stat):
                 processesWaitingTime[index] = processesWaitingTime[index] + self.convertToWaitingTime(e)
                 processesReturnTime[index] = processesReturnTime[index] + self.convertToReturnTime(e)
+                started[index] = started[index] or e == 'R'
+                if not started[index]:
+                    processesResponseTime[index] += 1
         avgWaitingTime = self.avgTime(processesWaitingTime)
         avgReturnTime = self.avgTime(processesReturnTime)
         return dict([('processesWaitingTime', processesWaitingTime),
                      ('processesReturnTime', processesReturnTime),
+                     ('processesResponseTime', processesResponseTime),
                      ('avgWaitingTime', avgWaitingTime),
-                     ('avgReturnTime', avgReturnTime)])
+                     ('avgReturnTime', avgReturnTime),
+                     ('avgResponseTime', self.avgTime(processesResponseTime))])
 
     ## Shows a complete statistics of processes execution
     def showStats(self):
@@ -348,6 +1421,57 @@ class StatTable():
         log.logger.info(
             tabulate(enumerate(times['processesReturnTime'], start=1), headers=headerReturn, tablefmt='psql'))
         log.logger.info("Tiempo de retorno promedio: {avgTime}".format(avgTime=times['avgReturnTime']))
+        log.logger.info("Tiempo de respuesta promedio: {avgTime}".format(avgTime=times['avgResponseTime']))
+        log.logger.info("Equidad (indice de Jain): {fairness:.3f}, ponderada por prioridad: {weighted:.3f}".format(
+            fairness=self.fairnessIndex(), weighted=self.fairnessIndex(True)))
+        log.logger.info("Page faults: {pageFaults} (lecturas de swap: {swapIns})".format(pageFaults=self.__pageFaults, swapIns=self.__swapIns))
+        log.logger.info(tabulate([stat.values() for stat in self.coreStats()],
+                                 headers=["Core", "Utilizacion", "Instrucciones/tick", "Terminados", "Terminados/tick",
+                                          "TLB hits", "TLB misses", "TLB flushes"],
+                                 tablefmt='psql'))
+        log.logger.info(tabulate(self.schedulingStats().items(), tablefmt='psql'))
+        log.logger.info(tabulate(self.__kernel.memoryManager.fragmentation().items(), tablefmt='psql'))
+        log.logger.info(tabulate(self.__kernel.loader.stats().items(), tablefmt='psql'))
+        log.logger.info(tabulate(self.__kernel.memoryManager.sharingStats().items(), tablefmt='psql'))
+        if self.deadlineResults() or self.__rejections:
+            log.logger.info(tabulate([result.values() for result in self.deadlineResults()],
+                                     headers=["PID", "Programa", "Deadline", "Termino", "Retraso", "Vencido"],
+                                     tablefmt='psql'))
+            log.logger.info(tabulate(self.deadlineStats().items(), tablefmt='psql'))
+
+
+## programas que el usuario pidio ejecutar en un tick futuro
+class ArrivalTable():
+    def __init__(self, kernel):
+        self.__kernel = kernel
+        self.__arrivals = []
+        self.__count = 0
+        kernel.hardware.clock.addSubscriber(self)
+
+    ## admitted: es una instancia de una tarea periodica que ya paso el test de admision
+    def add(self, tickNbr, program, priority, deadline = None, admitted = False):
+        ## el contador desempata llegadas en el mismo tick por orden de pedido
+        heappush(self.__arrivals, (tickNbr, self.__count, program, priority, deadline, admitted))
+        self.__count += 1
+
+    def hasArrivals(self):
+        return len(self.__arrivals) != 0
+
+    def tick(self, tickNbr):
+        while self.__arrivals and self.__arrivals[0][0] <= tickNbr:
+            tick, count, program, priority, deadline, admitted = heappop(self.__arrivals)
+            if admitted:
+                self.__kernel.release(program, priority, deadline)
+            else:
+                self.__kernel.run(program, priority, deadline)
+
+    def idleTicks(self, tickNbr):
+        if self.__arrivals:
+            return max(0, self.__arrivals[0][0] - tickNbr)
+        return math.inf
+
+    def skipTicks(self, tickNbr, times):
+        pass
 
 
 ## emulates the  Interruptions Handlers
@@ -362,39 +1486,48 @@ class AbstractInterruptionHandler:
     def execute(self, irq):
         log.logger.error("-- EXECUTE MUST BE OVERRIDEN in class {classname}".format(classname=self.__class__.__name__))
 
-    def runPCB(self, pcb):
-        HARDWARE.timer.reset()
+    def runPCB(self, pcb, core):
+        self.kernel.hardware.timers[core].reset()
+        self.kernel.scheduler.programTimer(pcb, core)
         pcb.state = ProcessState.RUNNING
-        self.kernel.pcbTable.runningPcb = pcb
-        self.kernel.dispatcher.load(pcb)
-
-    def runNext(self):
-        pcb = self.kernel.scheduler.getNext()
-        self.runPCB(pcb)
-
-    def tryToRunReadyQ(self):
-        if self.kernel.scheduler.hasNext():
-            self.runNext()
-
-    def saveProcessState(self, processState):
-        process = self.kernel.pcbTable.runningPcb
-        self.kernel.dispatcher.save(process)
-        self.kernel.pcbTable.runningPcb = None
+        self.kernel.pcbTable.setRunningPcb(core, pcb)
+        self.kernel.dispatcher.load(pcb, core)
+
+    def runNext(self, core):
+        pcb = self.kernel.scheduler.getNext(core)
+        self.runPCB(pcb, core)
+
+    def tryToRunReadyQ(self, core):
+        if self.kernel.scheduler.hasNext(core):
+            self.runNext(core)
+
+    def saveProcessState(self, processState, core):
+        process = self.kernel.pcbTable.getRunningPcb(core)
+        self.kernel.scheduler.charge(process, core)
+        self.kernel.dispatcher.save(process, core)
+        self.kernel.pcbTable.setRunningPcb(core, None)
         process.state = processState
         return process
 
+    ## si hay un core libre el proceso corre ahi; si no, se expropia el core cuyo
+    ## proceso el scheduler considera "peor" (si es que alguno debe ser expropiado)
     def runProgramIfPosible(self, pcb):
-        pcbInCPU = self.kernel.pcbTable.runningPcb
-        if pcbInCPU:
+        idleCore = self.kernel.dispatcher.idleCore(pcb)
+        if idleCore is not None:
+            self.runPCB(pcb, idleCore)
+            return
+        victimCore = None
+        for core, pcbInCPU in self.kernel.pcbTable.runningPcbs():
             if self.kernel.scheduler.mustExpropiate(pcbInCPU, pcb):
-                pcbReady = self.saveProcessState(ProcessState.READY)
-                self.kernel.scheduler.add(pcbReady)
-                self.runPCB(pcb)
-            else:
-                pcb.state = ProcessState.READY
-                self.kernel.scheduler.add(pcb)
+                if victimCore is None or self.kernel.scheduler.mustExpropiate(pcbInCPU, self.kernel.pcbTable.getRunningPcb(victimCore)):
+                    victimCore = core
+        if victimCore is not None:
+            pcbReady = self.saveProcessState(ProcessState.READY, victimCore)
+            self.kernel.scheduler.add(pcbReady)
+            self.runPCB(pcb, victimCore)
         else:
-            self.runPCB(pcb)
+            pcb.state = ProcessState.READY
+            self.kernel.scheduler.add(pcb)
 
 
 class StatsInterruptionHandler(AbstractInterruptionHandler):
@@ -422,12 +1555,16 @@ class StatsInterruptionHandler(AbstractInterruptionHandler):
 class TimeoutInterruptionHandler(AbstractInterruptionHandler):
 
     def execute(self, irq):
-        if (self.kernel.scheduler.hasNext()):
-            process = self.saveProcessState(ProcessState.READY)
+        pcb = self.kernel.pcbTable.getRunningPcb(irq.core)
+        self.kernel.scheduler.quantumExpired(pcb)
+        if (self.kernel.scheduler.hasNext(irq.core)):
+            process = self.saveProcessState(ProcessState.READY, irq.core)
             self.kernel.scheduler.add(process)
-            self.runNext()
+            self.runNext(irq.core)
         else:
-            HARDWARE.timer.reset()
+            self.kernel.scheduler.charge(pcb, irq.core)
+            self.kernel.hardware.timers[irq.core].reset()
+            self.kernel.scheduler.programTimer(pcb, irq.core)
 
 
 class NewInterruptionHandler(AbstractInterruptionHandler):
@@ -440,6 +1577,8 @@ class NewInterruptionHandler(AbstractInterruptionHandler):
         pagesCount = math.ceil(programSize / self.kernel.frameSize)
         pageTable = [None] * pagesCount
         newPcb = Pcb(pid, pageTable, path, priority)
+        if len(irq.parameters) > 2:
+            newPcb.deadline = irq.parameters[2]
         log.logger.info("\n Executing program: {name}".format(name=newPcb.path))
         self.kernel.pcbTable.add(newPcb)
         self.runProgramIfPosible(newPcb)
@@ -450,112 +1589,241 @@ class KillInterruptionHandler(AbstractInterruptionHandler):
 
     def execute(self, irq):
         log.logger.info(" Program Finished ")
-        pageTable = self.kernel.pcbTable.runningPcb.pageTable
-        for p in pageTable:
-            if p:
-                self.kernel.memoryManager.setFreeFrame(p)
-        self.saveProcessState(ProcessState.TERMINATED)
-        self.tryToRunReadyQ()
+        pcb = self.kernel.pcbTable.getRunningPcb(irq.core)
+        self.kernel.loader.resolvePrefetched()
+        self.kernel.memoryManager.setFreeFrames(pcb)
+        ## el ASID del proceso ya no se va a usar: liberamos sus entradas de las TLBs
+        for mmu in self.kernel.hardware.mmus:
+            mmu.flushTLB(pcb.pid)
+        self.saveProcessState(ProcessState.TERMINATED, irq.core)
+        self.kernel.statTable.addCompletion(irq.core, pcb)
+        self.tryToRunReadyQ(irq.core)
 
 class IoInInterruptionHandler(AbstractInterruptionHandler):
 
     def execute(self, irq):
-        processToIO = self.saveProcessState(ProcessState.WAITING)
+        processToIO = self.saveProcessState(ProcessState.WAITING, irq.core)
+        self.kernel.scheduler.blocked(processToIO)
         operation = irq.parameters
         self.kernel.ioDeviceController.runOperation(processToIO, operation)
         log.logger.info(self.kernel.ioDeviceController)
-        self.tryToRunReadyQ()
+        self.tryToRunReadyQ(irq.core)
 
 
+## el parametro de la interrupcion es el id del dispositivo que termino
 class IoOutInterruptionHandler(AbstractInterruptionHandler):
 
     def execute(self, irq):
+        swapController = self.kernel.swapController
+        if swapController is not None and irq.parameters == self.kernel.hardware.swapDevice.deviceId:
+            self.pageRead(swapController)
+            return
         pcb = self.kernel.ioDeviceController.getFinishedPCB()
         self.runProgramIfPosible(pcb)
         log.logger.info(self.kernel.ioDeviceController)
 
+    ## el disco de swap termino de leer la pagina: se carga y el proceso vuelve a estar listo
+    def pageRead(self, swapController):
+        page = swapController.currentOperation
+        pcb = swapController.getFinishedPCB()
+        if pcb.pageTable[page] is None:
+            self.kernel.loader.loadPcbPages(pcb, page)
+        self.runProgramIfPosible(pcb)
+        log.logger.info(swapController)
+
+## sin disco de swap la pagina se carga en el momento. Con disco, si la pagina ya esta
+## en memoria (la cargo otro proceso del mismo programa) solo se mapea; si no, el
+## proceso espera en WAITING a que el disco la lea y el core pasa a otro proceso
 class PageFaultInterruptionHandler(AbstractInterruptionHandler):
 
     def execute(self, irq):
         page = irq.parameters
-        self.kernel.loader.loadPage(page)
-
-
-
+        self.kernel.statTable.addPageFault()
+        swapController = self.kernel.swapController
+        if swapController is None:
+            self.kernel.loader.loadPage(page, irq.core)
+            return
+        pcb = self.kernel.pcbTable.getRunningPcb(irq.core)
+        if self.kernel.memoryManager.mapSharedPage(pcb, page):
+            return
+        self.kernel.statTable.addSwapIn()
+        self.saveProcessState(ProcessState.WAITING, irq.core)
+        swapController.runOperation(pcb, page)
+        log.logger.info(swapController)
+        self.tryToRunReadyQ(irq.core)
+
+
+
+## con prefetch > 0, en cada page fault tambien se cargan las paginas siguientes
+## (mientras haya frames libres). La ventana es adaptativa: crece de a una pagina
+## cada vez que una pagina precargada se llega a usar y se achica a la mitad cada
+## vez que una se desaloja (o el proceso termina) sin haberse usado
 class Loader:
 
-    def __init__(self, kernel, frameSize):
+    def __init__(self, kernel, frameSize, prefetch = 0):
         self._kernel = kernel
         self._frameSize = frameSize
+        self._maxPrefetch = prefetch
+        self._window = prefetch
+        ## paginas precargadas que todavia no se sabe si se usaron: frame -> SharedPage
+        self._pendingPrefetch = dict()
+        self._prefetched = 0
+        self._prefetchUsed = 0
+        self._prefetchWasted = 0
 
-    def loadPage(self, page):
-        runningPCb = self._kernel.pcbTable.runningPcb
-        path = runningPCb.path
-        program = self._kernel.fileSystem.getProgram(path)
-        i = page * self._frameSize
-        instructionsLoaded = 0
-        frame = self._kernel.memoryManager.getFreeFrame()
-        HARDWARE.mmu.setPageFrame(page, frame)
-        runningPCb.pageTable[page] = frame
-        while i < len(program) and instructionsLoaded < self._frameSize:
-            offset = i % self._frameSize
-            position = (frame * self._frameSize) + offset
-            HARDWARE.memory.write(position, program[i])
-            instructionsLoaded += 1
-            i += 1
-        log.logger.info(HARDWARE)
+    @property
+    def prefetchWindow(self):
+        return self._window
+
+    ## carga la pagina del proceso que esta corriendo en el core indicado
+    def loadPage(self, page, core = 0):
+        self.loadPcbPages(self._kernel.pcbTable.getRunningPcb(core), page)
+
+    ## carga la pagina page de pcb y, si hay frames libres, las siguientes de la ventana
+    def loadPcbPages(self, pcb, page):
+        self.resolvePrefetched()
+        self.loadPcbPage(pcb, page)
+        memoryManager = self._kernel.memoryManager
+        pageTable = pcb.pageTable
+        for nextPage in range(page + 1, min(page + 1 + self._window, len(pageTable))):
+            if memoryManager.freeFramesCount == 0:
+                break
+            if pageTable[nextPage] is None and not memoryManager.mapSharedPage(pcb, nextPage):
+                frame = self.loadPcbPage(pcb, nextPage)
+                self._pendingPrefetch[frame] = memoryManager.frameTable[frame]
+                self._prefetched += 1
+        log.logger.info(self._kernel.hardware)
+
+    ## si otro proceso del mismo programa ya cargo la pagina, solo se mapea
+    def loadPcbPage(self, pcb, page):
+        memoryManager = self._kernel.memoryManager
+        if memoryManager.mapSharedPage(pcb, page):
+            return pcb.pageTable[page]
+        program = self._kernel.fileSystem.getProgram(pcb.path)
+        pageBaseDir = page * self._frameSize
+        hardware = self._kernel.hardware
+        frame = memoryManager.getFreeFrame(pcb, page)
+        ## la MMU apunta a esta misma tabla, asi que ya ve la pagina cargada
+        pcb.pageTable[page] = frame
+        hardware.mmu.clearFrameBits(frame)
+        ## la pagina se copia de a porciones de corridas, no instruccion por instruccion
+        frameBaseDir = frame * self._frameSize
+        for addr, instruction, times in program.runs(pageBaseDir, pageBaseDir + self._frameSize):
+            hardware.memory.writeRun(frameBaseDir + addr - pageBaseDir, instruction, times)
+        return frame
+
+    ## una pagina precargada se uso si su frame tiene el bit de referencia prendido y
+    ## sigue teniendo esa pagina; si el frame ya tiene otra cosa, se fue sin usarse.
+    ## Se llama antes de elegir una victima (que puede limpiar los bits de referencia)
+    ## y antes de liberar los frames de un proceso que termina
+    def resolvePrefetched(self):
+        if not self._pendingPrefetch:
+            return
+        referenceBits = self._kernel.hardware.mmu.referenceBits
+        frameTable = self._kernel.memoryManager.frameTable
+        for frame, loaded in list(self._pendingPrefetch.items()):
+            if frameTable[frame] is not loaded:
+                del self._pendingPrefetch[frame]
+                self._prefetchWasted += 1
+                self._window = max(1, self._window // 2)
+            elif referenceBits[frame]:
+                del self._pendingPrefetch[frame]
+                self._prefetchUsed += 1
+                self._window = min(self._maxPrefetch, self._window + 1)
+
+    ## cada pagina precargada que se uso es un page fault que no hubo
+    def stats(self):
+        resolved = self._prefetchUsed + self._prefetchWasted
+        return {'prefetched': self._prefetched,
+                'prefetchUsed': self._prefetchUsed,
+                'prefetchWasted': self._prefetchWasted,
+                'prefetchAccuracy': self._prefetchUsed / resolved if resolved else 0,
+                'faultsAvoided': self._prefetchUsed,
+                'prefetchWindow': self._window}
 
 class Dispatcher:
 
-    def load(self, pcb):
-        log.logger.info("Dispatcher Load: {pcb}".format(pcb=pcb))
-        pageTable = pcb.pageTable
-        for page, frame in enumerate(pageTable):
-            HARDWARE.mmu.setPageFrame(page, frame)
-        HARDWARE.cpu.pc = pcb.pc
-
-    def save(self, pcb):
-        log.logger.info("Dispatcher Save: {pcb}".format(pcb=pcb))
-        pcb.pc = HARDWARE.cpu.pc
-        HARDWARE.cpu.pc = -1
+    def __init__(self, hardware):
+        self._hardware = hardware
+        self._migrations = 0
+
+    ## retorna un core que no esta ejecutando ningun proceso (o None),
+    ## prefiriendo el ultimo core donde corrio pcb
+    def idleCore(self, pcb = None):
+        if pcb is not None and pcb.lastCore is not None and not self._hardware.cpus[pcb.lastCore].isBusy():
+            return pcb.lastCore
+        for core, cpu in enumerate(self._hardware.cpus):
+            if not cpu.isBusy():
+                return core
+        return None
+
+    ## cantidad de veces que un proceso fue despachado en un core distinto al anterior
+    @property
+    def migrations(self):
+        return self._migrations
+
+    def load(self, pcb, core = 0):
+        log.logger.info("Dispatcher Load: {pcb} on core {core}".format(pcb=pcb, core=core))
+        if pcb.lastCore is not None and pcb.lastCore != core:
+            self._migrations += 1
+        pcb.lastCore = core
+        mmu = self._hardware.mmus[core]
+        mmu.asid = pcb.pid
+        mmu.pageTable = pcb.pageTable
+        mmu.limit = len(pcb.pageTable) * mmu.frameSize - 1
+        self._hardware.cpus[core].pc = pcb.pc
+
+    def save(self, pcb, core = 0):
+        log.logger.info("Dispatcher Save: {pcb} on core {core}".format(pcb=pcb, core=core))
+        cpu = self._hardware.cpus[core]
+        pcb.pc = cpu.pc
+        cpu.pc = -1
 
 
 # emulates the core of an Operative System
 class Kernel:
 
-    def __init__(self, scheduler, frameSize, algorithmType):
+    ## prefetch: maximo de paginas siguientes que el Loader carga en cada page fault
+    def __init__(self, hardware, scheduler, frameSize, algorithmType, prefetch = 0):
+        self._hardware = hardware
+
         ## setup interruption handlers
         self._newHandler = NewInterruptionHandler(self)
-        HARDWARE.interruptVector.register(NEW_INTERRUPTION_TYPE, self._newHandler)
+        hardware.interruptVector.register(NEW_INTERRUPTION_TYPE, self._newHandler)
 
         killHandler = KillInterruptionHandler(self)
-        HARDWARE.interruptVector.register(KILL_INTERRUPTION_TYPE, killHandler)
+        hardware.interruptVector.register(KILL_INTERRUPTION_TYPE, killHandler)
 
         ioInHandler = IoInInterruptionHandler(self)
-        HARDWARE.interruptVector.register(IO_IN_INTERRUPTION_TYPE, ioInHandler)
+        hardware.interruptVector.register(IO_IN_INTERRUPTION_TYPE, ioInHandler)
 
         ioOutHandler = IoOutInterruptionHandler(self)
-        HARDWARE.interruptVector.register(IO_OUT_INTERRUPTION_TYPE, ioOutHandler)
+        hardware.interruptVector.register(IO_OUT_INTERRUPTION_TYPE, ioOutHandler)
 
         timeOutHandler = TimeoutInterruptionHandler(self)
-        HARDWARE.interruptVector.register(TIMEOUT_INTERRUPTION_TYPE, timeOutHandler)
+        hardware.interruptVector.register(TIMEOUT_INTERRUPTION_TYPE, timeOutHandler)
 
         statsHandler = StatsInterruptionHandler(self)
-        HARDWARE.interruptVector.register(STAT_INTERRUPTION_TYPE, statsHandler)
+        hardware.interruptVector.register(STAT_INTERRUPTION_TYPE, statsHandler)
 
         pageFaultHandler = PageFaultInterruptionHandler(self)
-        HARDWARE.interruptVector.register(PAGE_FAULT_INTERRUPTION_TYPE, pageFaultHandler)
+        hardware.interruptVector.register(PAGE_FAULT_INTERRUPTION_TYPE, pageFaultHandler)
 
         self._frameSize = frameSize
 
         ## controls the Hardware's I/O Device
-        self._ioDeviceController = IoDeviceController(HARDWARE.ioDevice)
+        self._ioDeviceController = IoDeviceController(hardware.ioDevice)
+
+        ## cola de lecturas de paginas del disco de swap (si la maquina tiene uno)
+        self._swapController = None
+        if hardware.swapDevice is not None:
+            self._swapController = IoDeviceController(hardware.swapDevice)
 
         ## setup loader
-        self._loader = Loader(self, frameSize)
+        self._loader = Loader(self, frameSize, prefetch)
 
         ## setup dispatcher
-        self._dispatcher = Dispatcher()
+        self._dispatcher = Dispatcher(hardware)
 
         ## setup PCB Table
         self._pcbTable = PcbTable()
@@ -568,26 +1836,42 @@ class Kernel:
 
         ## Inizializate FileSystem
         self._fileSystem = FileSystem()
+        scheduler.attach(self)
+
+        ## Inizializate ArrivalTable
+        self._arrivalTable = ArrivalTable(self)
 
         ## Inizializate Memory Manager
 
         ALGORITHM = {
-            VictimAlgorithim.FiFo: MemoryManager(FiFoAlgorithm(self)),
-            VictimAlgorithim.LRU: MemoryManager(LruAlgorithm(self)),
-            VictimAlgorithim.Clock: MemoryManager(ClockAlgorithm(self))
+            VictimAlgorithim.FiFo: FiFoAlgorithm,
+            VictimAlgorithim.LRU: LruAlgorithm,
+            VictimAlgorithim.Clock: ClockAlgorithm,
+            VictimAlgorithim.NRU: NruAlgorithm,
+            VictimAlgorithim.ARC: ArcAlgorithm,
+            VictimAlgorithim.TwoQ: TwoQAlgorithm,
+            VictimAlgorithim.ClockPro: ClockProAlgorithm
         }
 
-
-        self._memoryManager = ALGORITHM.get(algorithmType)
+        self._memoryManager = MemoryManager(ALGORITHM.get(algorithmType)(self), hardware, frameSize)
 
         ## Inizializate FrameSize
-        HARDWARE.mmu.frameSize = frameSize
+        for mmu in hardware.mmus:
+            mmu.frameSize = frameSize
+
 
+    @property
+    def hardware(self):
+        return self._hardware
 
     @property
     def ioDeviceController(self):
         return self._ioDeviceController
 
+    @property
+    def swapController(self):
+        return self._swapController
+
     @property
     def loader(self):
         return self._loader
@@ -612,6 +1896,10 @@ class Kernel:
     def fileSystem(self):
         return self._fileSystem
 
+    @property
+    def arrivalTable(self):
+        return self._arrivalTable
+
     @property
     def memoryManager(self):
         return self._memoryManager
@@ -621,9 +1909,41 @@ class Kernel:
         return self._frameSize
 
     ## emulates a "system call" for programs execution
-    def run(self, program, priority):
-        irq = IRQ(NEW_INTERRUPTION_TYPE, (program, priority))
+    ## deadline: ticks desde la llegada en los que el proceso tiene que terminar. Con period
+    ## el programa es una tarea periodica: se lanza cada period ticks, releases veces, y
+    ## cada instancia tiene su deadline (por defecto, el periodo). Retorna False si el
+    ## scheduler no admite el trabajo porque no podria cumplir los deadlines
+    def run(self, program, priority, deadline = None, period = None, releases = 1):
+        if period is not None and deadline is None:
+            deadline = period
+        if not self._scheduler.admit(program, deadline, period, releases):
+            log.logger.info("Rejected {program}: its deadline can't be met".format(program=program))
+            self._statTable.addRejection(program)
+            return False
+        if period is not None:
+            tick = self._hardware.clock.currentTick
+            for release in range(1, releases):
+                self._arrivalTable.add(tick + release * period, program, priority, deadline, True)
+        self.release(program, priority, deadline)
+        return True
+
+    ## crea el proceso de un trabajo ya admitido
+    def release(self, program, priority, deadline = None):
+        if deadline is not None:
+            deadline += self._hardware.clock.currentTick
+        irq = IRQ(NEW_INTERRUPTION_TYPE, (program, priority, deadline))
         self._newHandler.execute(irq)
 
+    ## verdadero cuando todos los procesos terminaron y no queda ninguno por llegar
+    def hasFinished(self):
+        for pcb in self._pcbTable.getPcbs():
+            if pcb.state != ProcessState.TERMINATED:
+                return False
+        return not self._arrivalTable.hasArrivals()
+
+    ## igual que run, pero el programa llega recien en el tick indicado
+    def runAt(self, tickNbr, program, priority, deadline = None):
+        self._arrivalTable.add(tickNbr, program, priority, deadline)
+
     def __repr__(self):
         return "Kernel "
@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+
+## Corre el emulador para una grilla de parametros (scheduler x algoritmo de
+## seleccion de victima x tamaño de frame x tamaño de memoria x cores x prefetch x tiempo
+## del disco de swap) repartiendo las
+## corridas entre todos los cores con un ProcessPoolExecutor, y junta los
+## tiempos de espera/retorno y los page faults en un reporte CSV o JSONL.
+##
+##   python sweep.py --frame-sizes 2 4 8 --memory-sizes 16 32 --output report.csv
+
+import argparse
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+from kernelBuilder import *
+
+
+## carga de trabajo por defecto: los mismos programas que main.py
+## cada elemento es (programa, prioridad, tick de llegada), opcionalmente seguido de un
+## deadline (ticks desde la llegada, ver Kernel.run)
+DEFAULT_WORKLOAD = [
+    (Program("prg1.exe", [ASM.CPU(2), ASM.IO(), ASM.IO(), ASM.IO(), ASM.CPU(3), ASM.IO(), ASM.CPU(2)]), 3, 0),
+    (Program("prg2.exe", [ASM.CPU(25)]), 2, 0),
+    (Program("prg3.exe", [ASM.CPU(4), ASM.IO(), ASM.IO(), ASM.IO(), ASM.CPU(1)]), 4, 0),
+]
+
+DEFAULT_MAX_TICKS = 100000
+
+REPORT_FIELDS = ['schedulerType', 'algorithmType', 'frameSize', 'memorySize', 'cores', 'prefetch', 'swapTime', 'finished', 'ticks',
+                 'pageFaults', 'pageLoads', 'swapIns', 'faultsAvoided', 'prefetchAccuracy', 'avgWaitingTime', 'avgReturnTime', 'avgResponseTime', 'fairness', 'weightedFairness', 'deadlineMisses', 'maxLateness', 'rejected', 'processesWaitingTime',
+                 'processesReturnTime', 'coresUtilization', 'tlbHitRatio', 'error']
+
+
+## corre un punto de la grilla en una maquina nueva y retorna sus resultados
+def runScenario(schedulerType, algorithmType, frameSize, memorySize, cores = 1, prefetch = 0, swapTime = None, workload = DEFAULT_WORKLOAD, maxTicks = DEFAULT_MAX_TICKS):
+    result = {'schedulerType': schedulerType.name, 'algorithmType': algorithmType.name,
+              'frameSize': frameSize, 'memorySize': memorySize, 'cores': cores, 'prefetch': prefetch, 'swapTime': swapTime}
+    try:
+        hardware = Hardware()
+        hardware.setup(memorySize, cores, swapTime = swapTime)
+        hardware.cpu.enable_stats = True
+        hardware.clock.fastForward = True
+        hardware.cpu.burstMode = True
+        kernel = KERNEL_BUILDER.buildKernel(hardware, schedulerType, frameSize, algorithmType, prefetch = prefetch)
+
+        for program, priority, arrival, *deadline in workload:
+            kernel.fileSystem.write(program.name, program.instructions)
+        for program, priority, arrival, *deadline in workload:
+            deadline = deadline[0] if deadline else None
+            if arrival > 0:
+                kernel.runAt(arrival, program.name, priority, deadline)
+            else:
+                kernel.run(program.name, priority, deadline)
+
+        hardware.clock.do_ticks(maxTicks, until=kernel.hasFinished)
+
+        times = kernel.statTable.waitingTimes()
+        result.update({'finished': kernel.hasFinished(),
+                       'ticks': hardware.clock.currentTick + 1,
+                       'pageFaults': kernel.statTable.pageFaults,
+                       'pageLoads': kernel.memoryManager.sharingStats()['pageLoads'],
+                       'swapIns': kernel.statTable.swapIns,
+                       'faultsAvoided': kernel.loader.stats()['faultsAvoided'],
+                       'prefetchAccuracy': kernel.loader.stats()['prefetchAccuracy'],
+                       'avgWaitingTime': times['avgWaitingTime'],
+                       'avgReturnTime': times['avgReturnTime'],
+                       'avgResponseTime': times['avgResponseTime'],
+                       'fairness': kernel.statTable.fairnessIndex(),
+                       'weightedFairness': kernel.statTable.fairnessIndex(True),
+                       'deadlineMisses': kernel.statTable.deadlineStats()['deadlineMisses'],
+                       'maxLateness': kernel.statTable.deadlineStats()['maxLateness'],
+                       'rejected': kernel.statTable.deadlineStats()['rejected'],
+                       'processesWaitingTime': times['processesWaitingTime'],
+                       'processesReturnTime': times['processesReturnTime'],
+                       'coresUtilization': [stat['utilization'] for stat in kernel.statTable.coreStats()],
+                       'tlbHitRatio': tlbHitRatio(hardware)})
+    except Exception as e:
+        ## un punto invalido (por ej. memoria menor a un frame) no corta el barrido
+        result['error'] = repr(e)
+    return result
+
+
+def tlbHitRatio(hardware):
+    hits = sum(mmu.tlb.hits for mmu in hardware.mmus)
+    lookups = hits + sum(mmu.tlb.misses for mmu in hardware.mmus)
+    return hits / lookups if lookups else 0
+
+
+def _runPoint(point):
+    return runScenario(*point)
+
+
+def buildGrid(schedulerTypes, algorithmTypes, frameSizes, memorySizes, cores = (1,), prefetch = (0,), swapTimes = (None,)):
+    return list(product(schedulerTypes, algorithmTypes, frameSizes, memorySizes, cores, prefetch, swapTimes))
+
+
+## corre todos los puntos de la grilla en paralelo (maxWorkers=None usa todos los cores)
+def sweep(grid, workload = DEFAULT_WORKLOAD, maxTicks = DEFAULT_MAX_TICKS, maxWorkers = None):
+    points = [point + (workload, maxTicks) for point in grid]
+    workers = maxWorkers or os.cpu_count() or 1
+    chunksize = max(1, len(points) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_runPoint, points, chunksize=chunksize))
+
+
+def writeReport(results, path):
+    with open(path, 'w', newline='') as report:
+        if path.endswith('.csv'):
+            writer = csv.DictWriter(report, fieldnames=REPORT_FIELDS)
+            writer.writeheader()
+            for result in results:
+                row = dict(result)
+                for field in ('processesWaitingTime', 'processesReturnTime', 'coresUtilization'):
+                    if field in row:
+                        row[field] = json.dumps(row[field])
+                writer.writerow(row)
+        else:
+            for result in results:
+                report.write(json.dumps(result) + '\n')
+
+
+def parseArguments():
+    parser = argparse.ArgumentParser(description='Barrido de parametros del emulador')
+    parser.add_argument('--schedulers', nargs='+', default=[t.name for t in SchedulerType],
+                        choices=[t.name for t in SchedulerType])
+    parser.add_argument('--algorithms', nargs='+', default=[a.name for a in VictimAlgorithim],
+                        choices=[a.name for a in VictimAlgorithim])
+    parser.add_argument('--frame-sizes', nargs='+', type=int, default=[2, 4, 8])
+    parser.add_argument('--memory-sizes', nargs='+', type=int, default=[16, 32, 64])
+    parser.add_argument('--cores', nargs='+', type=int, default=[1])
+    parser.add_argument('--prefetch', nargs='+', type=int, default=[0],
+                        help='ventana maxima de paginas precargadas en cada page fault')
+    parser.add_argument('--swap-times', nargs='+', type=int, default=None,
+                        help='ticks que tarda el disco de swap en leer una pagina (sin esto los page faults son instantaneos)')
+    parser.add_argument('--max-ticks', type=int, default=DEFAULT_MAX_TICKS)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--output', default='sweep.csv', help='.csv para CSV, cualquier otra extension para JSONL')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parseArguments()
+    grid = buildGrid([SchedulerType[name] for name in args.schedulers],
+                     [VictimAlgorithim[name] for name in args.algorithms],
+                     args.frame_sizes, args.memory_sizes, args.cores, args.prefetch,
+                     args.swap_times or [None])
+    results = sweep(grid, maxTicks=args.max_ticks, maxWorkers=args.workers)
+    writeReport(results, args.output)
+    print("{count} corridas -> {output}".format(count=len(results), output=args.output))
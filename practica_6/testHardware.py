@@ -0,0 +1,193 @@
+from hardware import *
+import unittest
+
+
+class TickCounter():
+    def __init__(self):
+        self.ticks = []
+
+    def tick(self, tickNbr):
+        self.ticks.append(tickNbr)
+
+    def idleTicks(self, tickNbr):
+        if tickNbr < 5:
+            return 5 - tickNbr
+        return 0
+
+    def skipTicks(self, tickNbr, times):
+        pass
+
+
+class PlainSubscriber():
+    def tick(self, tickNbr):
+        pass
+
+
+class ClockFastForwardTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        self.clock.fastForward = True
+        self.counter = TickCounter()
+        self.clock.addSubscriber(self.counter)
+
+    def test_los_ticks_ociosos_se_saltean(self):
+        self.clock.do_ticks(8)
+        self.assertEqual([5, 6, 7], self.counter.ticks)
+
+    def test_un_suscriptor_sin_idle_ticks_no_deja_saltear(self):
+        self.clock.addSubscriber(PlainSubscriber())
+        self.clock.do_ticks(3)
+        self.assertEqual([0, 1, 2], self.counter.ticks)
+
+    def test_el_dispositivo_ocupado_avisa_cuando_termina(self):
+        device = PrinterIODevice(InterruptVector())
+        device.execute(INSTRUCTION_IO)
+        self.assertEqual(3, device.idleTicks(0))
+        device.skipTicks(0, 3)
+        self.assertEqual(0, device.idleTicks(3))
+
+
+class ClockTickRateTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        self.counter = TickCounter()
+        self.clock.addSubscriber(self.counter)
+
+    def test_sin_limite_no_espera_entre_ticks(self):
+        self.clock.tickRate = None
+        self.clock.do_ticks(1000)
+        self.assertEqual(1000, self.clock.ticksRun)
+        self.assertGreater(self.clock.achievedTickRate, 1000)
+
+    def test_en_tiempo_real_respeta_los_ticks_por_segundo(self):
+        self.clock.tickRate = 200
+        self.clock.do_ticks(20)
+        self.assertAlmostEqual(200, self.clock.achievedTickRate, delta=40)
+        self.assertLess(self.clock.drift, 0.05)
+
+
+class MemoryTest(unittest.TestCase):
+    def test_cada_celda_ocupa_un_byte(self):
+        memory = Memory(1000000)
+        self.assertEqual(1000000, len(memory._cells))
+        self.assertIsInstance(memory._cells, bytearray)
+
+    def test_escribo_una_corrida_de_opcodes(self):
+        memory = Memory(8)
+        memory.writeRun(2, INSTRUCTION_CPU, 3)
+        memory.write(5, INSTRUCTION_EXIT)
+        self.assertEqual([0, 0, 1, 1, 1, 3, 0, 0], list(memory._cells))
+        self.assertEqual(INSTRUCTION_EXIT, memory.read(5))
+
+
+class IRQCollector():
+    def __init__(self):
+        self.irqs = []
+
+    def execute(self, irq):
+        self.irqs.append(irq.type)
+
+
+class CpuDispatchTest(unittest.TestCase):
+    def setUp(self):
+        self.hardware = Hardware()
+        self.hardware.setup(4)
+        self.hardware.mmu.frameSize = 4
+        self.hardware.mmu.pageTable = [0]
+        self.collector = IRQCollector()
+        for irqType in (KILL_INTERRUPTION_TYPE, IO_IN_INTERRUPTION_TYPE):
+            self.hardware.interruptVector.register(irqType, self.collector)
+        self.hardware.memory.write(0, INSTRUCTION_CPU)
+        self.hardware.memory.write(1, INSTRUCTION_IO)
+        self.hardware.memory.write(2, INSTRUCTION_EXIT)
+        self.hardware.cpu.pc = 0
+
+    def test_cada_opcode_dispara_su_interrupcion(self):
+        for tickNbr in range(3):
+            self.hardware.cpu.tick(tickNbr)
+        self.assertEqual([IO_IN_INTERRUPTION_TYPE, KILL_INTERRUPTION_TYPE], self.collector.irqs)
+
+
+class CpuBurstTest(unittest.TestCase):
+    def setUp(self):
+        self.hardware = Hardware()
+        self.hardware.setup(8)
+        self.hardware.mmu.frameSize = 4
+        self.hardware.mmu.pageTable = [1]
+        self.hardware.memory.writeRun(4, INSTRUCTION_CPU, 3)
+        self.hardware.memory.write(7, INSTRUCTION_IO)
+        self.hardware.cpu.burstMode = True
+        self.hardware.cpu.pc = 0
+
+    def test_la_rafaga_llega_hasta_la_instruccion_de_io(self):
+        self.assertEqual(3, self.hardware.cpu.idleTicks(0))
+
+    def test_la_rafaga_se_corta_en_el_quantum(self):
+        self.hardware.timer.quantum = 2
+        self.assertEqual(2, self.hardware.timer.idleTicks(0))
+
+    def test_saltear_la_rafaga_avanza_el_pc(self):
+        self.hardware.timer.skipTicks(0, 3)
+        self.assertEqual(3, self.hardware.cpu.pc)
+        self.assertEqual(0, self.hardware.cpu.idleTicks(3))
+
+    def test_sin_modo_rafaga_no_se_saltea_nada(self):
+        self.hardware.cpu.burstMode = False
+        self.assertEqual(0, self.hardware.cpu.idleTicks(0))
+
+
+class TLBTest(unittest.TestCase):
+    def setUp(self):
+        self.tlb = TLB(4, 2)
+
+    def test_un_miss_y_despues_un_hit(self):
+        self.assertIsNone(self.tlb.lookup(1, 0))
+        self.tlb.insert(1, 0, 7)
+        self.assertEqual(7, self.tlb.lookup(1, 0))
+        self.assertEqual((1, 1), (self.tlb.hits, self.tlb.misses))
+
+    def test_las_entradas_estan_etiquetadas_con_el_asid(self):
+        self.tlb.insert(1, 0, 7)
+        self.assertIsNone(self.tlb.lookup(2, 0))
+
+    def test_la_capacidad_esta_acotada(self):
+        for page in range(10):
+            self.tlb.insert(1, page, page)
+        entries = sum(1 for page in range(10) if self.tlb.lookup(1, page) is not None)
+        self.assertLessEqual(entries, 4)
+
+    def test_flush_de_un_asid(self):
+        self.tlb.insert(1, 0, 7)
+        self.tlb.insert(2, 0, 8)
+        self.tlb.flush(1)
+        self.assertIsNone(self.tlb.lookup(1, 0))
+        self.assertEqual(8, self.tlb.lookup(2, 0))
+        self.assertEqual(1, self.tlb.flushes)
+
+    def test_invalidar_un_frame(self):
+        self.tlb.insert(1, 0, 7)
+        self.tlb.invalidateFrame(7)
+        self.assertIsNone(self.tlb.lookup(1, 0))
+
+
+class MMUUsageTest(unittest.TestCase):
+    def setUp(self):
+        self.mmu = MMU(Memory(8), IRQCollector())
+
+    def test_el_menos_usado_es_el_que_se_usa_hace_mas_tiempo(self):
+        for frame in [3, 1, 2, 3, 1]:
+            self.mmu.setLastUse(frame)
+        self.assertEqual(2, self.mmu.getLastUsed())
+        self.assertEqual(3, self.mmu.getLastUsed())
+
+    def test_el_fetch_prende_el_bit_de_referencia(self):
+        self.mmu.frameSize = 4
+        self.mmu.pageTable = [1]
+        self.mmu.fetch(2)
+        self.assertEqual(1, self.mmu.referenceBits[1])
+        self.assertEqual(0, self.mmu.referenceBits[0])
+        self.mmu.clearReferenceBits(2)
+        self.assertEqual(0, self.mmu.referenceBits[1])
+
+if __name__=='__main__':
+    unittest.main()
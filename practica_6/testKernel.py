@@ -0,0 +1,230 @@
+from kernelBuilder import *
+from replacementBenchmark import compareAlgorithms, WORKLOADS
+import schedulerBenchmark
+import unittest
+
+
+def newKernel(cores, schedulerType = SchedulerType.FirstComeFirstServed, memorySize = 32, frameSize = 4, algorithmType = VictimAlgorithim.FiFo, prefetch = 0, swapTime = None):
+    hardware = Hardware()
+    hardware.setup(memorySize, cores, swapTime = swapTime)
+    hardware.cpu.enable_stats = True
+    hardware.clock.fastForward = True
+    kernel = KERNEL_BUILDER.buildKernel(hardware, schedulerType, frameSize, algorithmType, prefetch = prefetch)
+    return hardware, kernel
+
+
+def load(kernel, *programs):
+    for program in programs:
+        kernel.fileSystem.write(program.name, program.instructions)
+
+
+class MultiCoreKernelTest(unittest.TestCase):
+    def setUp(self):
+        self.hardware, self.kernel = newKernel(2)
+        load(self.kernel, Program("prg1.exe", [ASM.CPU(5)]), Program("prg2.exe", [ASM.CPU(5)]))
+
+    def test_cada_proceso_corre_en_un_core_distinto(self):
+        self.kernel.run("prg1.exe", 1)
+        self.kernel.run("prg2.exe", 1)
+        self.assertEqual(0, self.kernel.pcbTable.getRunningPcb(0).pid)
+        self.assertEqual(1, self.kernel.pcbTable.getRunningPcb(1).pid)
+
+    def test_con_dos_cores_no_hay_tiempo_de_espera(self):
+        self.kernel.run("prg1.exe", 1)
+        self.kernel.run("prg2.exe", 1)
+        self.hardware.clock.do_ticks(100, until=self.kernel.hasFinished)
+        self.assertEqual(0, self.kernel.statTable.waitingTimes()['avgWaitingTime'])
+        self.assertEqual([1, 1], [stat['completed'] for stat in self.kernel.statTable.coreStats()])
+
+    def test_cada_core_reporta_su_utilizacion(self):
+        self.kernel.run("prg1.exe", 1)
+        self.hardware.clock.do_ticks(10)
+        stats = self.kernel.statTable.coreStats()
+        self.assertEqual(0.6, stats[0]['utilization'])
+        self.assertEqual(0, stats[1]['utilization'])
+
+
+class PageEvictionTest(unittest.TestCase):
+    def test_el_core_deja_de_usar_un_frame_desalojado(self):
+        hardware, kernel = newKernel(2, memorySize=4, frameSize=2)
+        prg1 = Program("prg1.exe", [ASM.CPU(7)])
+        prg2 = Program("prg2.exe", [ASM.CPU(2), ASM.IO(), ASM.CPU(2)])
+        load(kernel, prg1, prg2)
+        kernel.run("prg1.exe", 1)
+        kernel.run("prg2.exe", 1)
+        hardware.clock.do_ticks(200, until=kernel.hasFinished)
+        self.assertTrue(kernel.hasFinished())
+        total = len(prg1.instructions) + len(prg2.instructions)
+        self.assertEqual(total, sum(cpu.instructions for cpu in hardware.cpus))
+
+    def test_al_terminar_se_liberan_todos_los_frames(self):
+        hardware, kernel = newKernel(1, memorySize=8, frameSize=2)
+        load(kernel, Program("prg1.exe", [ASM.CPU(5)]), Program("prg2.exe", [ASM.CPU(3)]))
+        kernel.run("prg1.exe", 1)
+        kernel.run("prg2.exe", 1)
+        hardware.clock.do_ticks(100, until=kernel.hasFinished)
+        self.assertEqual([None] * 4, kernel.memoryManager.frameTable)
+        self.assertEqual(4, kernel.memoryManager.freeFramesCount)
+
+
+class VictimSelectionTest(unittest.TestCase):
+    def setUp(self):
+        self.hardware, self.kernel = newKernel(1, memorySize=8, frameSize=2, algorithmType=VictimAlgorithim.NRU)
+        self.pcb = Pcb(0, [None] * 4, "prg.exe", 1)
+        for page in range(4):
+            self.pcb.pageTable[page] = self.kernel.memoryManager.getFreeFrame(self.pcb, page)
+
+    def test_nru_elige_un_frame_no_referenciado(self):
+        referenceBits = self.hardware.mmu.referenceBits
+        for frame in [0, 1, 3]:
+            referenceBits[frame] = 1
+        self.assertEqual(2, self.kernel.memoryManager.getFreeFrame(self.pcb, 0))
+        self.assertEqual([0, 1, None, 3], self.pcb.pageTable)
+        sharedPage = self.kernel.memoryManager.frameTable[2]
+        self.assertEqual(("prg.exe", 0, [self.pcb]), (sharedPage.path, sharedPage.page, sharedPage.pcbs))
+        self.assertEqual(0, sum(referenceBits[:4]))
+
+
+class ScanResistanceTest(unittest.TestCase):
+
+    def test_arc_protege_una_pagina_reusada_por_otro_proceso(self):
+        hardware, kernel = newKernel(1, memorySize=8, frameSize=2, algorithmType=VictimAlgorithim.ARC)
+        pcb = Pcb(0, [None] * 8, "prg.exe", 1)
+        for page in range(4):
+            pcb.pageTable[page] = kernel.memoryManager.getFreeFrame(pcb, page)
+        self.assertTrue(kernel.memoryManager.mapSharedPage(Pcb(1, [None] * 8, "prg.exe", 1), 0))
+        self.assertEqual(1, kernel.memoryManager.getFreeFrame(pcb, 4))
+
+    def test_los_algoritmos_nuevos_leen_menos_paginas_con_un_recorrido(self):
+        loads = {row['algorithmType']: row['pageLoads'] for row in compareAlgorithms({'scan+hot': WORKLOADS['scan+hot']})}
+        for algorithm in ['ARC', 'TwoQ', 'ClockPro']:
+            self.assertLess(loads[algorithm], min(loads['FiFo'], loads['LRU'], loads['Clock']))
+
+
+class DeadlineTest(unittest.TestCase):
+    def setUp(self):
+        self.hardware, self.kernel = newKernel(1, SchedulerType.EarliestDeadlineFirst, memorySize=64)
+        self.kernel.fileSystem.write("job.exe", Program("job.exe", [ASM.CPU(9)]).instructions)
+
+    def test_rechaza_un_trabajo_que_haria_vencer_los_deadlines(self):
+        self.assertTrue(self.kernel.run("job.exe", 1, deadline=12))
+        self.assertFalse(self.kernel.run("job.exe", 1, deadline=15))
+        self.assertTrue(self.kernel.run("job.exe", 1, deadline=20))
+        self.hardware.clock.do_ticks(100, until=self.kernel.hasFinished)
+        self.assertEqual({'deadlineJobs': 2, 'deadlineMisses': 0, 'maxLateness': 0, 'avgLateness': -1, 'rejected': 1},
+                         self.kernel.statTable.deadlineStats())
+
+    def test_una_tarea_periodica_se_lanza_en_cada_periodo(self):
+        self.assertTrue(self.kernel.run("job.exe", 1, period=20, releases=3))
+        self.assertFalse(self.kernel.run("job.exe", 1, period=15, releases=2))
+        self.hardware.clock.do_ticks(100, until=self.kernel.hasFinished)
+        deadlines = [result['deadline'] for result in self.kernel.statTable.deadlineResults()]
+        self.assertEqual([20, 40, 60], deadlines)
+        self.assertEqual(0, self.kernel.statTable.deadlineStats()['deadlineMisses'])
+
+
+class SchedulerComparisonTest(unittest.TestCase):
+
+    def test_cfs_reparte_el_cpu_segun_la_prioridad_mejor_que_round_robin(self):
+        workloads = {'multi-tenant': schedulerBenchmark.WORKLOADS['multi-tenant']}
+        roundRobin, cfs = schedulerBenchmark.compareSchedulers(workloads, (SchedulerType.RoundRobin, SchedulerType.CompletelyFair))
+        self.assertGreater(cfs['weightedFairness'], roundRobin['weightedFairness'])
+        self.assertLess(cfs['avgResponseTime'], roundRobin['avgResponseTime'])
+
+
+    def test_srtf_tiene_el_menor_tiempo_de_espera(self):
+        rows = schedulerBenchmark.compareSchedulers({'mixed': schedulerBenchmark.WORKLOADS['mixed']})
+        waitingTimes = {row['schedulerType']: row['avgWaitingTime'] for row in rows}
+        self.assertEqual(min(waitingTimes.values()), waitingTimes['ShortestRemainingTime'])
+
+
+    def test_edf_no_vence_deadlines_que_otros_schedulers_vencen(self):
+        rows = schedulerBenchmark.compareSchedulers({'deadlines': schedulerBenchmark.WORKLOADS['deadlines']})
+        misses = {row['schedulerType']: row['deadlineMisses'] for row in rows}
+        self.assertEqual(0, misses['EarliestDeadlineFirst'])
+        self.assertGreater(misses['RoundRobin'], 0)
+
+
+class PrefetchTest(unittest.TestCase):
+    def runSequential(self, prefetch):
+        hardware, kernel = newKernel(1, memorySize=32, frameSize=2, prefetch=prefetch)
+        load(kernel, Program("prg.exe", [ASM.CPU(15)]))
+        kernel.run("prg.exe", 1)
+        hardware.clock.do_ticks(100, until=kernel.hasFinished)
+        self.assertTrue(kernel.hasFinished())
+        return kernel
+
+    def test_sin_prefetch_hay_un_fault_por_pagina(self):
+        self.assertEqual(8, self.runSequential(0).statTable.pageFaults)
+
+    def test_el_prefetch_ahorra_faults_en_un_programa_secuencial(self):
+        kernel = self.runSequential(3)
+        stats = kernel.loader.stats()
+        self.assertEqual(2, kernel.statTable.pageFaults)
+        self.assertEqual(6, stats['faultsAvoided'])
+        self.assertEqual(1, stats['prefetchAccuracy'])
+
+
+class SharedPagesTest(unittest.TestCase):
+    def test_los_procesos_del_mismo_programa_comparten_frames(self):
+        hardware, kernel = newKernel(2, schedulerType=SchedulerType.RoundRobin, memorySize=16, frameSize=2)
+        load(kernel, Program("prg.exe", [ASM.CPU(5)]))
+        for i in range(4):
+            kernel.run("prg.exe", 1)
+        hardware.clock.do_ticks(2)
+        pageTables = [pcb.pageTable for core, pcb in kernel.pcbTable.runningPcbs()]
+        self.assertEqual(pageTables[0], pageTables[1])
+        self.assertEqual(1, kernel.memoryManager.sharingStats()['residentPages'])
+        hardware.clock.do_ticks(200, until=kernel.hasFinished)
+        self.assertTrue(kernel.hasFinished())
+        self.assertEqual(24, sum(cpu.instructions for cpu in hardware.cpus))
+        self.assertEqual(8, kernel.memoryManager.freeFramesCount)
+
+
+class SwapTest(unittest.TestCase):
+    def setUp(self):
+        self.hardware, self.kernel = newKernel(1, frameSize=4, swapTime=3)
+        load(self.kernel, Program("prg.exe", [ASM.CPU(3)]))
+        self.kernel.run("prg.exe", 1)
+
+    def test_el_proceso_espera_al_disco_sin_ejecutar_la_instruccion(self):
+        self.hardware.clock.do_ticks(1)
+        pcb = list(self.kernel.pcbTable.getPcbs())[0]
+        self.assertEqual(ProcessState.WAITING, pcb.state)
+        self.assertEqual(0, pcb.pc)
+        self.assertFalse(self.hardware.cpu.isBusy())
+
+    def test_cuando_el_disco_termina_el_proceso_sigue(self):
+        self.hardware.clock.do_ticks(100, until=self.kernel.hasFinished)
+        self.assertTrue(self.kernel.hasFinished())
+        self.assertEqual(1, self.kernel.statTable.swapIns)
+        self.assertEqual(4, self.hardware.cpu.instructions)
+        self.assertLess(self.hardware.cpu.utilization, 1)
+
+
+class FrameAllocatorTest(unittest.TestCase):
+    def setUp(self):
+        self.allocator = FrameAllocator(6)
+
+    def test_asigna_siempre_el_libre_mas_bajo(self):
+        self.assertEqual([0, 1, 2], self.allocator.allocateMany(3))
+        self.allocator.free(1)
+        self.assertEqual(1, self.allocator.allocate())
+        self.assertEqual(3, self.allocator.allocate())
+
+    def test_sin_frames_libres(self):
+        self.allocator.allocateMany(6)
+        self.assertIsNone(self.allocator.allocate())
+        with self.assertRaises(Exception):
+            self.allocator.allocateMany(1)
+
+    def test_reporte_de_fragmentacion(self):
+        self.allocator.allocateMany(6)
+        self.allocator.freeMany([0, 2, 3])
+        report = self.allocator.fragmentation()
+        self.assertEqual({'freeFrames': 3, 'holes': 2, 'largestHole': 2}, {k: report[k] for k in ['freeFrames', 'holes', 'largestHole']})
+        self.assertAlmostEqual(1 / 3, report['fragmentation'])
+
+
+if __name__=='__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+from so import *
+import unittest
+
+
+class ProgramImageTest(unittest.TestCase):
+    def setUp(self):
+        self.program = Program("prg.exe", [ASM.CPU(3), ASM.IO(), ASM.CPU(1000000)])
+        self.image = self.program.instructions
+
+    def test_las_rafagas_se_guardan_como_corridas(self):
+        self.assertEqual(4, self.image.runsCount())
+        self.assertEqual(1000005, len(self.image))
+
+    def test_se_agrega_exit_al_final(self):
+        self.assertTrue(ASM.isEXIT(self.image[len(self.image) - 1]))
+
+    def test_leo_instrucciones_por_direccion_logica(self):
+        self.assertEqual(INSTRUCTION_CPU, self.image[2])
+        self.assertEqual(INSTRUCTION_IO, self.image[3])
+        self.assertEqual(INSTRUCTION_CPU, self.image[4])
+
+    def test_una_pagina_mapea_porciones_de_corridas(self):
+        runs = list(self.image.runs(2, 6))
+        self.assertEqual([(2, INSTRUCTION_CPU, 1), (3, INSTRUCTION_IO, 1), (4, INSTRUCTION_CPU, 2)], runs)
+
+    def test_la_ultima_pagina_se_corta_en_el_fin_del_programa(self):
+        runs = list(self.image.runs(1000000, 1000008))
+        self.assertEqual([(1000000, INSTRUCTION_CPU, 4), (1000004, INSTRUCTION_EXIT, 1)], runs)
+
+    def test_la_rafaga_llega_hasta_el_proximo_io_inclusive(self):
+        self.assertEqual(4, self.image.burstLength(0))
+        self.assertEqual(2, self.image.burstLength(2))
+        self.assertEqual(1, self.image.burstLength(3))
+        self.assertEqual(1000001, self.image.burstLength(4))
+
+    def test_las_listas_expandidas_siguen_siendo_validas(self):
+        program = Program("prg.exe", [[INSTRUCTION_CPU] * 2, ASM.IO()])
+        self.assertEqual(3, program.instructions.runsCount())
+
+
+if __name__=='__main__':
+    unittest.main()
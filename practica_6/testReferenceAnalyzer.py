@@ -0,0 +1,41 @@
+from kernelBuilder import *
+from referenceAnalyzer import *
+import unittest
+
+
+## la secuencia de referencias clasica de Silberschatz
+REFERENCES = [7, 0, 1, 2, 0, 3, 0, 4, 2, 3, 0, 3, 2, 1, 2, 0, 1, 7, 0, 1]
+
+
+class ReferenceAnalyzerTest(unittest.TestCase):
+
+    def test_opt_con_tres_frames(self):
+        self.assertEqual(9, optMisses(REFERENCES, 3))
+
+    def test_curva_de_lru_para_todos_los_tamaños(self):
+        self.assertEqual([20, 20, 17, 12, 8, 7, 6], lruMissCurve(REFERENCES))
+
+    def test_opt_nunca_tiene_mas_faults_que_lru(self):
+        for row in compare(REFERENCES, [1, 2, 3, 4, 5]):
+            self.assertLessEqual(row['optMisses'], row['lruMisses'])
+
+
+class ReferenceRecordingTest(unittest.TestCase):
+
+    def test_la_curva_predice_los_faults_del_emulador(self):
+        hardware = Hardware()
+        hardware.setup(8)
+        hardware.clock.fastForward = True
+        hardware.cpu.burstMode = True
+        references = hardware.recordReferences()
+        kernel = KERNEL_BUILDER.buildKernel(hardware, SchedulerType.FirstComeFirstServed, 2, VictimAlgorithim.LRU)
+        program = Program("prg.exe", [ASM.CPU(5), ASM.IO(), ASM.CPU(3)])
+        kernel.fileSystem.write(program.name, program.instructions)
+        kernel.run(program.name, 1)
+        hardware.clock.do_ticks(100, until=kernel.hasFinished)
+        self.assertEqual(len(program.instructions), len(references))
+        self.assertEqual(kernel.statTable.pageFaults, lruMissCurve(references, 4)[4])
+
+
+if __name__=='__main__':
+    unittest.main()
@@ -14,12 +14,16 @@ pcb3 = Pcb(3, 15, prg3, 1)
 
 mysteriousPCB = Pcb(99, 99, prg1, 0)
 
-HARDWARE.setup(25)
+
+def newHardware():
+    hardware = Hardware()
+    hardware.setup(25)
+    return hardware
 
 
 class SchedulerFCFSTest(unittest.TestCase):
     def setUp(self):
-        self.scheduler = SchedulerFCFS()
+        self.scheduler = SchedulerFCFS(newHardware())
         self.scheduler.add(pcb1)
         self.scheduler.add(pcb2)
         self.scheduler.add(pcb3)
@@ -45,15 +49,14 @@ class SchedulerFCFSTest(unittest.TestCase):
 
 class SchedulerPriorityTest(unittest.TestCase):
     def setUp(self):
-        self.scheduler = SchedulerPriority()
+        self.scheduler = SchedulerPriority(newHardware())
         self.scheduler.add(pcb1)
         self.scheduler.add(pcb2)
         self.scheduler.add(pcb3)
 
     def test_agrego_un_pcb_y_esta_en_readyQ(self):
         self.scheduler.add(mysteriousPCB)
-        pcbInReadyQ = self.scheduler.readyQ[0].pop()[0]
-        self.assertEqual(mysteriousPCB, pcbInReadyQ)
+        self.assertTrue(mysteriousPCB in [pcb for key, sequence, pcb in self.scheduler.readyQ])
 
     def test_pido_el_proximo_y_me_da_pcb_3_porque_fue_es_el_de_mayor_prioridad(self):
         self.assertEqual(pcb3, self.scheduler.getNext())
@@ -70,9 +73,32 @@ class SchedulerPriorityTest(unittest.TestCase):
     def test_must_expropiate_da_falso_ya_que_este_scheduler_no_es_expropiativo(self):
         self.assertFalse(self.scheduler.mustExpropiate(pcb1, pcb3))
 
+class SchedulerPriorityAgingTest(unittest.TestCase):
+    def setUp(self):
+        self.hardware = newHardware()
+        self.scheduler = SchedulerPriority(self.hardware)
+
+    def test_un_proceso_que_espera_pasa_adelante_de_uno_de_mayor_prioridad_que_llega_despues(self):
+        self.scheduler.add(pcb2)
+        self.hardware.clock.tick(10)
+        self.scheduler.add(pcb3)
+        self.assertEqual(pcb2, self.scheduler.getNext())
+
+    def test_con_la_misma_prioridad_envejecida_sale_el_que_llego_primero(self):
+        self.scheduler.add(pcb2)
+        self.hardware.clock.tick(9)
+        self.scheduler.add(pcb3)
+        self.assertEqual(pcb2, self.scheduler.getNext())
+
+    def test_acepta_cualquier_cantidad_de_niveles(self):
+        lowPriorityPCB = Pcb(20, 0, prg2, 12)
+        self.scheduler.add(lowPriorityPCB)
+        self.scheduler.add(pcb1)
+        self.assertEqual([pcb1, lowPriorityPCB], [self.scheduler.getNext(), self.scheduler.getNext()])
+
 class SchedulerPriorityPreentiveTest(unittest.TestCase):
     def setUp(self):
-        self.scheduler = SchedulerPriorityPRENTIVE()
+        self.scheduler = SchedulerPriorityPRENTIVE(newHardware())
 
     ##Los métodos getNext, hasNext y add se heredan del scheduler anterior.
 
@@ -84,13 +110,173 @@ class SchedulerPriorityPreentiveTest(unittest.TestCase):
 
 class SchedulerRoundRobinTest(unittest.TestCase):
     def setUp(self):
-        self.scheduler = SchedulerRoundRobin()
+        self.hardware = newHardware()
+        self.scheduler = SchedulerRoundRobin(self.hardware)
 
     # Los métodos getNext, hasNext, mustExpropiate y add se heredan
     # del abstract scheduler y ya fueron testeados.
 
     def test_inicio_el_scheduler_round_robin_y_se_setea_el_timer_en_true_con_quantum_3(self):
-        self.assertEqual(3, HARDWARE.timer.quantum)
+        self.assertEqual(3, self.hardware.timer.quantum)
+
+    def test_el_quantum_se_setea_solo_en_el_timer_de_su_hardware(self):
+        otherHardware = newHardware()
+        self.assertEqual(0, otherHardware.timer.quantum)
+
+
+class SchedulerMLFQTest(unittest.TestCase):
+    def setUp(self):
+        self.hardware = newHardware()
+        self.scheduler = SchedulerMLFQ(self.hardware)
+        self.cpuBound = Pcb(30, [], prg2, 1)
+        self.interactive = Pcb(31, [], prg1, 1)
+
+    def test_el_quantum_del_timer_depende_del_nivel(self):
+        self.scheduler.programTimer(self.cpuBound, 0)
+        self.assertEqual(2, self.hardware.timer.quantum)
+        self.scheduler.quantumExpired(self.cpuBound)
+        self.scheduler.programTimer(self.cpuBound, 0)
+        self.assertEqual(4, self.hardware.timer.quantum)
+
+    def test_el_que_uso_todo_su_quantum_queda_detras_del_que_hizo_io(self):
+        self.scheduler.quantumExpired(self.cpuBound)
+        self.scheduler.add(self.cpuBound)
+        self.scheduler.add(self.interactive)
+        self.assertEqual(self.interactive, self.scheduler.getNext())
+        self.assertTrue(self.scheduler.mustExpropiate(self.cpuBound, self.interactive))
+
+    def test_hacer_io_sube_un_nivel(self):
+        self.scheduler.quantumExpired(self.interactive)
+        self.scheduler.quantumExpired(self.interactive)
+        self.scheduler.blocked(self.interactive)
+        self.assertEqual(1, self.interactive.schedulingLevel)
+
+    def test_el_boost_periodico_sube_a_todos_al_primer_nivel(self):
+        self.scheduler.quantumExpired(self.cpuBound)
+        self.scheduler.add(self.cpuBound)
+        self.hardware.clock.tick(50)
+        self.scheduler.add(self.interactive)
+        self.assertEqual(self.cpuBound, self.scheduler.getNext())
+        self.assertEqual(0, self.cpuBound.schedulingLevel)
+        self.assertEqual(1, self.scheduler.stats()['boosts'])
+
+
+class SchedulerCFSTest(unittest.TestCase):
+    def setUp(self):
+        self.hardware = newHardware()
+        self.scheduler = SchedulerCFS(self.hardware)
+        self.highPriority = Pcb(40, [], prg2, 0)
+        self.lowPriority = Pcb(41, [], prg2, 3)
+        self.highPriority.lastCore = 0
+        self.lowPriority.lastCore = 0
+
+    def test_el_tiempo_corrido_se_cobra_ponderado_por_prioridad(self):
+        for pcb in [self.highPriority, self.lowPriority]:
+            self.scheduler.programTimer(pcb, 0)
+            self.hardware.timer.skipTicks(0, 4)
+            self.scheduler.charge(pcb, 0)
+            self.hardware.timer.reset()
+        self.assertEqual(4, self.highPriority.vruntime)
+        self.assertAlmostEqual(4 * 1.25 ** 3, self.lowPriority.vruntime)
+
+    def test_corre_el_de_menor_vruntime(self):
+        self.highPriority.vruntime = 10
+        self.lowPriority.vruntime = 8
+        self.scheduler.add(self.highPriority)
+        self.scheduler.add(self.lowPriority)
+        self.assertEqual(self.lowPriority, self.scheduler.getNext())
+
+    def test_un_proceso_nuevo_expropia_al_que_ya_corrio_mucho(self):
+        self.highPriority.vruntime = 0
+        self.scheduler.programTimer(self.highPriority, 0)
+        self.assertFalse(self.scheduler.mustExpropiate(self.highPriority, self.lowPriority))
+        self.hardware.timer.skipTicks(0, 3)
+        self.assertTrue(self.scheduler.mustExpropiate(self.highPriority, self.lowPriority))
+
+
+class SchedulerSJFTest(unittest.TestCase):
+    def setUp(self):
+        self.hardware = newHardware()
+        fileSystem = FileSystem()
+        for program in [prg1, prg2, prg3]:
+            fileSystem.write(program.name, program.instructions)
+        self.predictor = ImageBurstPredictor(fileSystem)
+        self.long = Pcb(50, [], prg2.name, 1)
+        self.short = Pcb(51, [], prg3.name, 1)
+        self.long.lastCore = 0
+
+    def test_corre_primero_el_de_rafaga_mas_corta(self):
+        scheduler = SchedulerSJF(self.hardware, self.predictor)
+        scheduler.add(self.long)
+        scheduler.add(self.short)
+        self.assertEqual(self.short, scheduler.getNext())
+
+    def test_srtf_expropia_si_la_rafaga_nueva_es_menor_a_lo_que_falta(self):
+        scheduler = SchedulerSRTF(self.hardware, self.predictor)
+        self.hardware.cpu.pc = 0
+        self.assertTrue(scheduler.mustExpropiate(self.long, self.short))
+        self.hardware.cpu.pc = 4
+        self.assertFalse(scheduler.mustExpropiate(self.long, self.short))
+
+    def test_el_promedio_exponencial_aprende_de_las_rafagas_anteriores(self):
+        predictor = ExponentialBurstPredictor(0.5, 10)
+        predictor.charge(self.long, 4)
+        predictor.burstEnded(self.long)
+        self.assertEqual(7, predictor.estimate(self.long))
+        predictor.charge(self.long, 3)
+        self.assertEqual(4, predictor.remaining(self.long, 0))
+
+
+class SchedulerEDFTest(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = SchedulerEDF(newHardware())
+        self.urgent = Pcb(60, [], prg1, 4)
+        self.relaxed = Pcb(61, [], prg1, 0)
+        self.background = Pcb(62, [], prg1, 0)
+        self.urgent.deadline = 10
+        self.relaxed.deadline = 30
+
+    def test_corre_primero_el_de_deadline_mas_cercano_y_al_final_el_que_no_tiene(self):
+        for pcb in [self.background, self.relaxed, self.urgent]:
+            self.scheduler.add(pcb)
+        self.assertEqual([self.urgent, self.relaxed, self.background], [self.scheduler.getNext() for i in range(3)])
+
+    def test_un_deadline_anterior_expropia(self):
+        self.assertTrue(self.scheduler.mustExpropiate(self.relaxed, self.urgent))
+        self.assertFalse(self.scheduler.mustExpropiate(self.urgent, self.relaxed))
+        self.assertTrue(self.scheduler.mustExpropiate(self.background, self.relaxed))
+
+
+class SchedulerPerCoreTest(unittest.TestCase):
+    def setUp(self):
+        self.hardware = Hardware()
+        self.hardware.setup(25, 2)
+        self.scheduler = SchedulerPerCore(self.hardware)
+        self.pcbA = Pcb(10, [], prg1, 1)
+        self.pcbB = Pcb(11, [], prg2, 1)
+        self.pcbA.lastCore = 1
+
+    def test_el_proceso_vuelve_a_la_cola_del_ultimo_core_donde_corrio(self):
+        self.scheduler.add(self.pcbA)
+        self.assertEqual(1, self.scheduler.readyQ[1].readyCount())
+
+    def test_un_proceso_nuevo_va_a_la_cola_menos_cargada(self):
+        self.scheduler.add(self.pcbA)
+        self.scheduler.add(self.pcbB)
+        self.assertEqual(1, self.scheduler.readyQ[0].readyCount())
+
+    def test_un_core_sin_trabajo_le_roba_a_la_cola_mas_cargada(self):
+        self.scheduler.add(self.pcbA)
+        self.assertTrue(self.scheduler.hasNext(0))
+        self.assertEqual(self.pcbA, self.scheduler.getNext(0))
+        self.assertEqual(1, self.scheduler.stats()['steals'])
+
+    def test_la_afinidad_se_abandona_si_la_cola_esta_muy_cargada(self):
+        for pid in range(4):
+            pcb = Pcb(pid, [], prg1, 1)
+            pcb.lastCore = 1
+            self.scheduler.add(pcb)
+        self.assertEqual(1, self.scheduler.readyQ[0].readyCount())
 
 
 if __name__=='__main__':